@@ -0,0 +1,44 @@
+"""Benchmark cached cards loading.
+
+Compares the size and load time of a partition of 10k cards, pickled by the
+disk index as a list of `Card` models, and stored in the compact format of
+`manabase.serialization`.
+
+Run from the repository root with ``python -m benchmarks.cache``.
+"""
+import pickle
+import timeit
+
+from manabase.decoding import decode_cards
+from manabase.serialization import dump_cards, load_cards
+
+from .decode import CARDS, REPEAT, SCRYFALL_OBJECT
+
+
+def main():
+    """Run the benchmark and print sizes and timings per 10k cards."""
+    objects = [
+        {**SCRYFALL_OBJECT, "name": f"{SCRYFALL_OBJECT['name']} {index}"}
+        for index in range(CARDS)
+    ]
+    cards = list(decode_cards(objects))
+
+    # ``diskcache`` pickles values with the highest protocol.
+    pickled = pickle.dumps(cards, protocol=pickle.HIGHEST_PROTOCOL)
+    compact = dump_cards(cards)
+
+    candidates = {
+        "pickled models": (pickled, lambda: pickle.loads(pickled)),
+        "compact format": (compact, lambda: load_cards(compact)),
+    }
+
+    for name, (data, function) in candidates.items():
+        best = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(
+            f"{name:<20} {len(data) / 1024:8.1f} KiB"
+            f" {best * 1000:8.1f} ms / {CARDS} cards"
+        )
+
+
+if __name__ == "__main__":
+    main()
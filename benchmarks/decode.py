@@ -0,0 +1,117 @@
+"""Benchmark card decoding.
+
+Compares full validation of raw scryfall objects with projected objects, and
+validation-free construction for trusted data, per 10k cards.
+
+Run from the repository root with ``python -m benchmarks.decode``.
+"""
+import copy
+import timeit
+
+from pydantic import ValidationError
+
+from manabase.cards import Card
+from manabase.decoding import decode_cards
+
+CARDS = 10_000
+REPEAT = 5
+
+SCRYFALL_OBJECT = {
+    "object": "card",
+    "id": "3e3f0bcd-0796-494d-bf51-94b33c1671e9",
+    "oracle_id": "f7c6be1a-2b2d-40f7-9f20-3e20fe97b7dd",
+    "multiverse_ids": [382208],
+    "name": "Tundra",
+    "lang": "en",
+    "released_at": "2014-06-16",
+    "uri": "https://api.scryfall.com/cards/3e3f0bcd-0796-494d-bf51-94b33c1671e9",
+    "scryfall_uri": "https://scryfall.com/card/vma/313/tundra",
+    "layout": "normal",
+    "highres_image": True,
+    "image_status": "highres_scan",
+    "image_uris": {
+        size: f"https://c1.scryfall.com/file/scryfall-cards/{size}/tundra.jpg"
+        for size in ("small", "normal", "large", "png", "art_crop", "border_crop")
+    },
+    "mana_cost": "",
+    "cmc": 0.0,
+    "type_line": "Land — Plains Island",
+    "oracle_text": "({T}: Add {W} or {U}.)",
+    "colors": [],
+    "color_identity": ["U", "W"],
+    "keywords": [],
+    "produced_mana": ["U", "W"],
+    "legalities": {
+        format_: "legal"
+        for format_ in (
+            "standard",
+            "future",
+            "historic",
+            "pioneer",
+            "modern",
+            "legacy",
+            "pauper",
+            "vintage",
+            "penny",
+            "commander",
+            "brawl",
+            "duel",
+            "oldschool",
+        )
+    },
+    "games": ["mtgo"],
+    "reserved": True,
+    "foil": True,
+    "nonfoil": False,
+    "oversized": False,
+    "promo": False,
+    "reprint": True,
+    "variation": False,
+    "set": "vma",
+    "set_name": "Vintage Masters",
+    "collector_number": "313",
+    "digital": True,
+    "rarity": "rare",
+    "artist": "Jesper Myrfors",
+    "border_color": "black",
+    "frame": "2015",
+    "full_art": False,
+    "textless": False,
+    "booster": True,
+    "story_spotlight": False,
+    "prices": {"usd": None, "usd_foil": None, "eur": None, "tix": "9.48"},
+    "related_uris": {
+        "gatherer": "https://gatherer.wizards.com/Pages/Card/Details.aspx",
+        "edhrec": "https://edhrec.com/route/?cc=Tundra",
+    },
+}
+
+
+def decode_raw(objects):
+    """The historical decoding: validate the full scryfall object."""
+    cards = []
+    for obj in objects:
+        try:
+            cards.append(Card(**obj))
+        except ValidationError:
+            continue
+    return cards
+
+
+def main():
+    """Run the benchmark and print timings per 10k cards."""
+    objects = [copy.deepcopy(SCRYFALL_OBJECT) for _ in range(CARDS)]
+
+    candidates = {
+        "validate raw objects": lambda: decode_raw(objects),
+        "validate projected objects": lambda: list(decode_cards(objects)),
+        "construct trusted objects": lambda: list(decode_cards(objects, True)),
+    }
+
+    for name, function in candidates.items():
+        best = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(f"{name:<30} {best * 1000:8.1f} ms / {CARDS} cards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark card records.
+
+Compares the allocation time and memory of `Card` models, validated or not,
+with `CardRecord` objects, and of filter results as pydantic models with
+`FilterResult` objects, per 10k cards.
+
+Run from the repository root with ``python -m benchmarks.records``.
+"""
+import timeit
+import tracemalloc
+from typing import Callable, List, Optional
+
+from pydantic import BaseModel
+
+from manabase.cards import Card, CardRecord
+from manabase.decoding import decode_cards, project
+from manabase.filters.base import CardFilter, FilterResult
+from manabase.filters.lands.original import OriginalDualLandFilter
+
+from .decode import CARDS, REPEAT, SCRYFALL_OBJECT
+
+
+class ModelFilterResult(BaseModel):
+    """The historical filter result, a pydantic model."""
+
+    card: Card
+    accepted_by: Optional[CardFilter] = None
+
+
+def measure(function: Callable[[], List]) -> str:
+    """Return the best time and memory allocated by ``function``."""
+    best = min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+    tracemalloc.start()
+    objects = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return f"{best * 1000:8.1f} ms {size / CARDS:8.0f} B/card"
+
+
+def main():
+    """Run the benchmark and print timings and memory per 10k cards."""
+    objects = [
+        project({**SCRYFALL_OBJECT, "name": f"{SCRYFALL_OBJECT['name']} {index}"})
+        for index in range(CARDS)
+    ]
+    cards = list(decode_cards(objects, trusted=True))
+    records = [CardRecord.from_card(card) for card in cards]
+    filter_ = OriginalDualLandFilter()
+
+    candidates = {
+        "validated models": lambda: [Card(**obj) for obj in objects],
+        "constructed models": lambda: [Card.construct(**obj) for obj in objects],
+        "records": lambda: [CardRecord.from_card(card) for card in cards],
+        "model results": lambda: [
+            ModelFilterResult(card=card, accepted_by=filter_) for card in cards
+        ],
+        "results": lambda: [
+            FilterResult(card=record, accepted_by=filter_) for record in records
+        ],
+    }
+
+    for name, function in candidates.items():
+        print(f"{name:<20} {measure(function)} / {CARDS} cards")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,9 @@ from typing import Optional
 import typer
 from pydantic import BaseModel
 
-from ..cache import CacheManager
+from ..cache import CacheManager, EvictionPolicy
 from ..settings import UserSettings
+from .cache import app as cache_app
 from .cache import clear_cache
 from .generate import generate
 from .presets import app as presets
@@ -23,16 +24,20 @@ class AppContext(BaseModel):
 app = typer.Typer()
 
 app.add_typer(presets, name="presets")
+app.add_typer(cache_app, name="cache")
 
 app.command()(generate)
 app.command()(clear_cache)
 
 
 @app.callback()
-def main(
+def main(  # pylint: disable=too-many-arguments
     ctx: typer.Context,
     config: Optional[Path] = None,
     cache: Optional[Path] = None,
+    cache_ttl: float = CacheManager.TTL,
+    cache_max_size: Optional[int] = None,
+    cache_eviction: EvictionPolicy = EvictionPolicy.lru,
 ):
     """Landing rock solid mana bases for your decks.
 
@@ -48,11 +53,18 @@ def main(
     else:
         settings = UserSettings(path=config_path)
 
-    cache_path: Path = (
-        cache if cache and cache.is_file() else CacheManager.default_path()
+    cache_path: Path = cache if cache else CacheManager.default_path()
+
+    cache_manager = CacheManager(
+        cache_path,
+        ttl=cache_ttl,
+        max_size=cache_max_size,
+        eviction=cache_eviction,
     )
-    cache_manager = CacheManager(cache_path)
 
     context = AppContext(settings=settings, cache=cache_manager)
 
+    # The model holds a copy of the manager, which commands record stats in.
+    ctx.call_on_close(context.cache.save_stats)
+
     ctx.obj = context
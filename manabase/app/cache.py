@@ -1,7 +1,216 @@
 """Cache management."""
+import re
+import time
+from json import dumps
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 
+from ..archive import UnsupportedArchive, export_cache, import_cache
 from ..cache import CacheManager
+from ..client import Client
+from ..defaults import default_sets
+from ..query import QueryType, SetQueryBuilder
+from ..settings import UserSettings
+from ..snapshot import CardSnapshot, write_snapshot
+
+app = typer.Typer()
+
+
+@app.callback()
+def main():
+    """Manage the card cache."""
+
+
+@app.command()
+def warm(  # pylint: disable=too-many-locals
+    ctx: typer.Context,
+    sets: Optional[str] = None,
+    types: str = "land,artifact",
+    jobs: int = 4,
+):
+    """Fetch sets missing from the cache.
+
+    Defaults to the default sets, and the sets of every preset.
+    Sets already cached are skipped, so an interrupted warm-up resumes where it
+    stopped.
+    """
+    settings: UserSettings = ctx.obj.settings
+    cache: CacheManager = ctx.obj.cache
+
+    if sets is not None:
+        set_codes = _split(sets)
+    else:
+        set_codes = default_sets()
+        for preset in settings.presets.values():
+            if preset.sets:
+                set_codes.extend(_split(preset.sets))
+
+    # Keep the first occurrence of each set.
+    set_codes = list(dict.fromkeys(set_codes))
+
+    try:
+        query_types = [QueryType(value) for value in _split(types)]
+    except ValueError as error:
+        typer.echo(typer.style(str(error), fg=typer.colors.RED))
+        raise typer.Exit(code=1) from error
+
+    pending = [
+        (query_type, cache.missing_sets(query_type, set_codes))
+        for query_type in query_types
+    ]
+    total = sum(len(missing) for _, missing in pending)
+
+    if not total:
+        typer.echo("Cache is already warm.")
+        return
+
+    done = 0
+    cards = 0
+    start = time.monotonic()
+
+    with Client(cache=cache, jobs=jobs) as client:
+        for query_type, missing in pending:
+            builder = SetQueryBuilder(type=query_type, sets=missing)
+            for set_code, count in client.iter_fill(builder, missing):
+                done += 1
+                cards += count
+                typer.echo(f"[{done}/{total}] {query_type.value} {set_code}: {count}")
+
+    elapsed = max(time.monotonic() - start, 1e-6)
+
+    typer.echo(
+        f"Warmed {done} sets ({cards} cards) in {elapsed:.1f}s, "
+        f"{done / elapsed:.1f} sets/s, {cards / elapsed:.1f} cards/s."
+    )
+
+
+@app.command()
+def stats(ctx: typer.Context, json: bool = False):
+    """Print cache statistics, gathered by every process using the cache."""
+    cache: CacheManager = ctx.obj.cache
+
+    totals = cache.total_stats()
+    partitions = sorted(
+        cache.iter_partitions(),
+        key=lambda partition: (partition[0].value, partition[1]),
+    )
+
+    if json:
+        data = {
+            "stats": {
+                **totals.dict(),
+                "hit_rate": totals.hit_rate,
+                "read_latency": totals.read_latency,
+            },
+            "partitions": [
+                {
+                    "type": query.value,
+                    "set": set_code,
+                    "size": info.size,
+                    "fetched_at": info.fetched_at,
+                }
+                for query, set_code, info in partitions
+            ],
+        }
+        typer.echo(dumps(data, indent=2))
+        return
+
+    size = sum(info.size for _, _, info in partitions)
+
+    lines = [
+        f"Hits: {totals.hits}",
+        f"Misses: {totals.misses}",
+        f"Hit rate: {_percent(totals.hit_rate)}",
+        f"Memory hits: {totals.memory_hits}",
+        f"Disk reads: {totals.disk_reads} ({_bytes(totals.bytes_read)})",
+        f"Read latency: {_milliseconds(totals.read_latency)}",
+        f"Writes: {totals.writes} ({_bytes(totals.bytes_written)})",
+        f"Evictions: {totals.evictions}",
+        f"Partitions: {len(partitions)} ({_bytes(size)})",
+    ]
+    lines.extend(
+        f"  {query.value} {set_code}: {_bytes(info.size)}"
+        for query, set_code, info in partitions
+    )
+
+    typer.echo("\n".join(lines))
+
+
+@app.command()
+def snapshot(ctx: typer.Context, path: Path):
+    """Export the cache into a read-only snapshot file.
+
+    Snapshots are memory mapped by readers, so that processes on the same host
+    share a single copy of the cards.
+    """
+    cache: CacheManager = ctx.obj.cache
+
+    write_snapshot(cache, path)
+
+    with CardSnapshot(path) as card_snapshot:
+        count = len(card_snapshot)
+        partitions = len(card_snapshot.partitions())
+
+    typer.echo(f"Exported {count} cards from {partitions} sets to {path}.")
+
+
+@app.command()
+def export(ctx: typer.Context, path: Path):
+    """Export the cache into a compressed archive, to import it on other hosts."""
+    cache: CacheManager = ctx.obj.cache
+
+    try:
+        manifest = export_cache(cache, path)
+    except OSError as error:
+        typer.echo(typer.style(str(error), fg=typer.colors.RED))
+        raise typer.Exit(code=1) from error
+
+    typer.echo(
+        f"Exported {len(manifest.partitions)} sets ({_bytes(manifest.size)}) "
+        f"to {path}."
+    )
+
+
+@app.command(name="import")
+def import_(ctx: typer.Context, path: Path):
+    """Import an archive exported by `manabase cache export` into the cache."""
+    cache: CacheManager = ctx.obj.cache
+
+    try:
+        manifest = import_cache(cache, path)
+    except (UnsupportedArchive, OSError) as error:
+        typer.echo(typer.style(str(error), fg=typer.colors.RED))
+        raise typer.Exit(code=1) from error
+
+    typer.echo(
+        f"Imported {len(manifest.partitions)} sets ({_bytes(manifest.size)}) "
+        f"from {path}."
+    )
+
+
+@app.command()
+def prune(ctx: typer.Context):
+    """Remove sets cached by incompatible manabase versions.
+
+    Also removes the cache directories of older versions, one per version.
+    """
+    cache: CacheManager = ctx.obj.cache
+
+    removed = CacheManager.prune_versions()
+    dropped = cache.drop_incompatible()
+
+    for path in removed:
+        typer.echo(f"Removed {path}")
+
+    typer.echo(f"Pruned {len(removed)} cache directories and {dropped} sets.")
+
+
+@app.command()
+def clear(ctx: typer.Context):
+    """Clear the cache."""
+    clear_cache(ctx)
 
 
 def clear_cache(ctx: typer.Context):
@@ -10,3 +219,20 @@ def clear_cache(ctx: typer.Context):
     cache.clear()
 
     typer.echo("Cache cleared.")
+
+
+def _split(values: str) -> List[str]:
+    """Split a list of values separated by spaces or commas."""
+    return [value for value in re.split(r"[\s,]+", values) if value]
+
+
+def _percent(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def _milliseconds(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value * 1000:.1f} ms"
+
+
+def _bytes(value: int) -> str:
+    return f"{value / 1024:.1f} KiB"
@@ -1,6 +1,8 @@
 """CLI."""
+
 # pylint: disable=too-many-arguments
-from typing import Callable, List, Optional
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import typer
 
@@ -9,7 +11,7 @@ from manabase.filters.set import CardSetFilter
 
 from ..cache import CacheManager
 from ..cards import CardList
-from ..client import Client
+from ..client import AsyncClient, Client
 from ..colors import Color
 from ..defaults import (
     default_land_filters,
@@ -44,6 +46,7 @@ def generate(  # pylint: disable=too-many-arguments, too-many-locals, too-many-b
     rock_filters: Optional[str] = None,
     rock_priorities: Optional[str] = None,
     sets: Optional[str] = None,
+    pushdown: bool = False,
 ):
     """Generate a manabase."""
     settings: UserSettings = ctx.obj.settings
@@ -83,13 +86,17 @@ def generate(  # pylint: disable=too-many-arguments, too-many-locals, too-many-b
 
     color_list = Color.from_string(colors)
 
-    client = Client(cache=cache)
+    sync_client = Client(cache=cache, prefetch=True)
+    client = AsyncClient(sync_client)
 
     # TODO: #12 Support more formatting options.
     formatter = Formatter(output=Output.list)
 
+    # Rocks and lands queries are fetched concurrently.
+    jobs: Dict[str, Awaitable[CardList]] = {}
+
     if rocks is not None and rocks > 0:
-        rock_list = generate_rocks(
+        jobs["Rocks"] = generate_rocks(
             rock_filters,
             rock_priorities,
             rocks,
@@ -97,12 +104,11 @@ def generate(  # pylint: disable=too-many-arguments, too-many-locals, too-many-b
             set_codes,
             color_list,
             client,
+            pushdown,
         )
-        typer.echo("// Rocks")
-        typer.echo(formatter.format_cards(rock_list))
 
     if lands > 0:
-        land_list = generate_lands(
+        jobs["Lands"] = generate_lands(
             filters,
             priorities,
             lands,
@@ -111,19 +117,34 @@ def generate(  # pylint: disable=too-many-arguments, too-many-locals, too-many-b
             set_codes,
             color_list,
             client,
+            pushdown,
         )
-        typer.echo("// Lands")
-        typer.echo(formatter.format_cards(land_list))
+
+    try:
+        card_lists = asyncio.run(_gather(*jobs.values()))
+
+        for title, card_list in zip(jobs, card_lists):
+            typer.echo(f"// {title}")
+            typer.echo(formatter.format_cards(card_list))
+    finally:
+        # Lists are printed first, then background refreshes are waited for,
+        # before cache statistics are saved.
+        sync_client.close()
+
+
+async def _gather(*jobs: Awaitable[CardList]) -> List[CardList]:
+    return list(await asyncio.gather(*jobs))
 
 
-def generate_rocks(
+async def generate_rocks(
     filter_string: Optional[str],
     priority_string: Optional[str],
     rocks: int,
     occurrences: int,
     sets: List[str],
     colors: List[Color],
-    client: Client,
+    client: AsyncClient,
+    pushdown: bool = False,
 ) -> CardList:
     """Generate the lands card list."""
     filter_manager = _parse_filters(filter_string, sets, colors, default_rock_filters)
@@ -141,12 +162,13 @@ def generate_rocks(
         priorities=priority_manager,
         query=query,
         filler=None,
+        pushdown=pushdown,
     )
 
-    return generator.generate(client)
+    return await generator.generate_async(client)
 
 
-def generate_lands(
+async def generate_lands(
     filter_string: Optional[str],
     priority_string: Optional[str],
     lands: int,
@@ -154,7 +176,8 @@ def generate_lands(
     weights: Optional[str],
     sets: List[str],
     colors: List[Color],
-    client: Client,
+    client: AsyncClient,
+    pushdown: bool = False,
 ) -> CardList:
     """Generate the lands card list."""
     filter_manager = _parse_filters(filter_string, sets, colors, default_land_filters)
@@ -176,9 +199,10 @@ def generate_lands(
         priorities=priority_manager,
         query=query,
         filler=filler,
+        pushdown=pushdown,
     )
 
-    return generator.generate(client)
+    return await generator.generate_async(client)
 
 
 def _parse_filters(
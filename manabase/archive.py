@@ -0,0 +1,203 @@
+"""Portable cache archives.
+
+An archive bundles the partitions of a cache, as serialized in the cache, and
+their metadata into a single gzip compressed tar file, to be baked into images
+or copied to machines without network access.
+
+The archive starts with a ``manifest.json`` member, listing each partition with
+its metadata and the SHA-256 checksum of its cards. Importing an archive checks
+every checksum, then loads all partitions in a single transaction.
+
+Archives hold cards serialized with a given `SCHEMA_VERSION`, and can only be
+imported by versions of manabase sharing it.
+
+Example::
+
+```python
+>>> from pathlib import Path
+>>> from tempfile import TemporaryDirectory
+>>> from manabase.archive import export_cache, import_cache
+>>> from manabase.cache import CacheManager
+>>> from manabase.cards import Card
+>>> from manabase.query import QueryType
+>>> card = Card.named("Tundra").copy(update={"set": "vma"})
+>>> with TemporaryDirectory() as directory:
+...     cache = CacheManager(Path(directory) / "cache")
+...     cache.write_cache(QueryType.land, ["vma"], [card])
+...     _ = export_cache(cache, Path(directory) / "cards.tar.gz")
+...     other = CacheManager(Path(directory) / "other")
+...     _ = import_cache(other, Path(directory) / "cards.tar.gz")
+...     [card.name for card in other.read_cache(QueryType.land, ["vma"])]
+['Tundra']
+
+```
+"""
+import gzip
+import hashlib
+import io
+import tarfile
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from .cache import CacheManager, PartitionData, PartitionInfo
+from .files import replace_file
+from .query import QueryType
+from .serialization import SCHEMA_VERSION
+
+ARCHIVE_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+class UnsupportedArchive(ValueError):
+    """Raised when a file is not a valid archive for this version."""
+
+
+class ArchiveEntry(BaseModel):
+    """A partition of an archive."""
+
+    type: QueryType
+    set: str
+    sha256: str
+    size: int
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ArchiveManifest(BaseModel):
+    """Contents of an archive."""
+
+    version: int = ARCHIVE_VERSION
+    schema_version: str = SCHEMA_VERSION
+    created_at: float
+    partitions: List[ArchiveEntry] = []
+
+    @property
+    def size(self) -> int:
+        """Size of the serialized cards of every partition."""
+        return sum(entry.size for entry in self.partitions)
+
+
+def export_cache(cache: CacheManager, path: Path) -> ArchiveManifest:
+    """Export every partition of ``cache`` into an archive at ``path``.
+
+    The archive is written next to ``path`` then moved over it, so that an
+    interrupted export never leaves a truncated archive.
+    """
+    partitions = sorted(
+        cache.iter_partition_data(),
+        key=lambda partition: (partition[0].value, partition[1]),
+    )
+    manifest = ArchiveManifest(
+        created_at=time.time(),
+        partitions=[
+            ArchiveEntry(
+                type=query,
+                set=set_code,
+                sha256=hashlib.sha256(data).hexdigest(),
+                size=len(data),
+                fetched_at=info.fetched_at,
+                etag=info.etag,
+                last_modified=info.last_modified,
+            )
+            for query, set_code, info, data in partitions
+        ],
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with replace_file(path) as handle:
+        with tarfile.open(fileobj=handle, mode="w:gz") as archive:
+            _add(archive, MANIFEST, manifest.json(indent=2).encode("utf-8"))
+            for query, set_code, _, data in partitions:
+                _add(archive, _member(query, set_code), data)
+
+    return manifest
+
+
+def import_cache(cache: CacheManager, path: Path) -> ArchiveManifest:
+    """Import the partitions of the archive at ``path`` into ``cache``.
+
+    Partitions already cached are replaced.
+
+    Raises:
+        UnsupportedArchive: If the archive cannot be read, is invalid,
+            corrupted, or holds cards of another schema.
+    """
+    try:
+        with tarfile.open(path, mode="r:gz") as archive:
+            manifest = _read_manifest(archive)
+            partitions: List[PartitionData] = []
+
+            for entry in manifest.partitions:
+                data = _read(archive, _member(entry.type, entry.set))
+
+                if hashlib.sha256(data).hexdigest() != entry.sha256:
+                    raise UnsupportedArchive(
+                        f"Checksum mismatch for {entry.type.value} {entry.set}."
+                    )
+
+                info = PartitionInfo(
+                    version="",
+                    fetched_at=entry.fetched_at,
+                    schema_version=manifest.schema_version,
+                    etag=entry.etag,
+                    last_modified=entry.last_modified,
+                )
+                partitions.append((entry.type, entry.set, info, data))
+    except (tarfile.TarError, gzip.BadGzipFile, zlib.error, EOFError) as error:
+        raise UnsupportedArchive(f"Invalid archive {path}.") from error
+    except OSError as error:
+        raise UnsupportedArchive(
+            f"Cannot read archive {path}: {error.strerror}."
+        ) from error
+
+    cache.load_partitions(partitions)
+
+    return manifest
+
+
+def _read_manifest(archive: tarfile.TarFile) -> ArchiveManifest:
+    try:
+        manifest = ArchiveManifest.parse_raw(_read(archive, MANIFEST))
+    except ValidationError as error:
+        raise UnsupportedArchive("Invalid archive manifest.") from error
+
+    if manifest.version != ARCHIVE_VERSION:
+        raise UnsupportedArchive(f"Unsupported archive version {manifest.version}.")
+
+    if manifest.schema_version != SCHEMA_VERSION:
+        raise UnsupportedArchive(
+            "The archive was exported by a version of manabase storing cards "
+            "differently."
+        )
+
+    return manifest
+
+
+def _member(query: QueryType, set_code: str) -> str:
+    return f"partitions/{query.value}/{set_code}"
+
+
+def _add(archive: tarfile.TarFile, name: str, data: bytes):
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    member.mtime = int(time.time())
+    archive.addfile(member, io.BytesIO(data))
+
+
+def _read(archive: tarfile.TarFile, name: str) -> bytes:
+    try:
+        file = archive.extractfile(name)
+    except KeyError as error:
+        raise UnsupportedArchive(f"Missing archive member {name}.") from error
+
+    if file is None:
+        raise UnsupportedArchive(f"Invalid archive member {name}.")
+
+    with file:
+        return file.read()
@@ -0,0 +1,153 @@
+"""Read cards from a scryfall bulk data file.
+
+Scryfall publishes [bulk data](https://scryfall.com/docs/api/bulk-data) files,
+such as ``oracle_cards`` or ``default_cards``: JSON arrays of every card
+object, weighting hundreds of megabytes.
+
+`BulkDataSource` streams such a file, decoding one card object at a time, so
+memory usage stays bounded by the size of a single card, and no request is
+ever sent to scryfall.
+"""
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Set
+
+from .cards import Card, merge_cards
+from .decoding import decode_card
+from .query import SetQueryBuilder
+from .source import CardSource
+
+
+class BulkDataSource(CardSource):
+    """A card source reading a local scryfall bulk data file.
+
+    Files ending with ``.gz`` are decompressed on the fly.
+
+    Bulk data files are trusted by default, so cards are built without
+    validation.
+
+    Like a scryfall search, a single printing of each card is returned.
+    `BulkDataSource.iter_cards` yields cards in file order, while
+    `BulkDataSource.fetch` sorts them by name.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(
+        self,
+        path: Path,
+        chunk_size: int = CHUNK_SIZE,
+        trusted: bool = True,
+    ):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.trusted = trusted
+
+    def fetch(self, builder: SetQueryBuilder) -> List[Card]:
+        return merge_cards([self.iter_cards(builder)])
+
+    def iter_cards(self, builder: SetQueryBuilder) -> Iterator[Card]:
+        type_regex = re.compile(rf"\b{builder.type.value}\b", re.IGNORECASE)
+        sets = set(builder.sets)
+        names: Set[str] = set()
+
+        for obj in self.iter_objects():
+
+            if sets and obj.get("set") not in sets:
+                continue
+            if not type_regex.search(obj.get("type_line", "")):
+                continue
+            if obj.get("name") in names:
+                continue
+
+            card = decode_card(obj, self.trusted)
+
+            if card is not None:
+                names.add(card.name)
+                yield card
+
+    def iter_objects(self) -> Iterator[Dict]:
+        """Iterate over raw card objects of the bulk data file."""
+        with self._open() as handle:
+            yield from iter_json_array(handle, self.chunk_size)
+
+    def _open(self) -> IO[str]:
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, "rt", encoding="utf-8")
+        return open(self.path, encoding="utf-8")
+
+
+def iter_json_array(handle: IO[str], chunk_size: int = 1 << 16) -> Iterator:
+    """Incrementally decode the items of a JSON array read from ``handle``.
+
+    Only the item being decoded, and a chunk of ``chunk_size`` characters, are
+    held in memory.
+
+    Example::
+
+    ```python
+    >>> from io import StringIO
+    >>> from manabase.bulk import iter_json_array
+    >>> list(iter_json_array(StringIO('[{"a": 1}, {"b": [2, 3]}]'), chunk_size=4))
+    [{'a': 1}, {'b': [2, 3]}]
+
+    ```
+
+    Raises:
+        ValueError: If the content is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+
+        # Skip separators between items.
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+
+        if position < len(buffer):
+
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Bulk data should be a JSON array.")
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A scalar cut by the end of the buffer, such as a number,
+                # decodes too: items are only complete once followed by a
+                # separator.
+                following = end
+                while following < len(buffer) and buffer[following] in " \t\r\n":
+                    following += 1
+
+                if following < len(buffer) and buffer[following] in ",]":
+                    position = end
+                    yield item
+                    continue
+
+                if eof:
+                    raise ValueError("Bulk data should be a JSON array.")
+
+        elif eof:
+            raise ValueError("Unexpected end of bulk data.")
+
+        # Either the buffer is exhausted, or the next item is incomplete.
+        chunk = handle.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
@@ -1,76 +1,633 @@
-"""Handles request cards caching."""
+"""Handles request cards caching.
+
+Cards are cached in partitions, one per query type and set code, so that only
+the sets missing from the cache are fetched, and only the requested sets are
+loaded.
+
+Partitions are stored in the compact format of `manabase.serialization`.
+Loaded partitions are kept in memory by a size bounded `LRUCache`, so
+long-lived processes do not unpickle them again on every read.
+Each partition write stores a new version stamp in the disk index: a partition
+held in memory is only used while its stamp matches, so writes from other
+processes are always seen.
+
+Partitions older than a time to live are stale: they are still served, and
+`Client` revalidates them in the background.
+
+The cache directory does not depend on the package version: each partition
+records the `SCHEMA_VERSION` it was written with, and partitions written with
+another schema are dropped and fetched again, one at a time.
+Metadata and statistics are stored as plain dicts, so that models gaining
+fields still read them.
+
+Lookups, reads and writes are counted in `CacheStats`.
+
+The cache size can be bounded: once cached cards exceed the bound, partitions
+are evicted, either least recently or least frequently used first.
+"""
+from __future__ import annotations
+
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import (
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from uuid import uuid4
 
 from appdirs import user_cache_dir
-from diskcache import Index
+from diskcache import Index, Lock
+from pydantic import ValidationError
 from pydantic.main import BaseModel
 
-from . import __app_name__, __version__
-from .cards import Card
+from . import __app_name__
+from .cards import Card, merge_cards
+from .lru import LRUCache
 from .query import QueryType
+from .serialization import (
+    SCHEMA_VERSION,
+    UnsupportedFormat,
+    dump_cards,
+    load_cards,
+)
+
+PartitionKey = Tuple[str, str, str]
+
+
+class EvictionPolicy(Enum):
+    """Order in which partitions are evicted from a full cache."""
+
+    lru = "lru"
+    lfu = "lfu"
+
+
+class PartitionInfo(BaseModel):
+    """Metadata of a cached partition.
+
+    ``etag`` and ``last_modified`` are the validators sent by the server, used
+    to check whether the partition changed without downloading it again.
+    ``schema_version`` is the `SCHEMA_VERSION` cards were serialized with.
+    """
+
+    version: str
+    fetched_at: float
+    schema_version: Optional[str] = None
+    size: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+PartitionData = Tuple[QueryType, str, PartitionInfo, bytes]
+
+
+class CacheStats(BaseModel):
+    """Cache counters and timings.
+
+    ``hits`` and ``misses`` count partitions found or missing when looking sets
+    up. Partitions read are either ``memory_hits``, or ``disk_reads`` taking
+    ``read_seconds`` to load ``bytes_read``.
+
+    Example::
+
+    ```python
+    >>> from manabase.cache import CacheStats
+    >>> stats = CacheStats(hits=3, misses=1) + CacheStats(hits=4)
+    >>> stats.hits, stats.hit_rate
+    (7, 0.875)
+
+    ```
+    """
+
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_reads: int = 0
+    bytes_read: int = 0
+    read_seconds: float = 0.0
+    writes: int = 0
+    bytes_written: int = 0
+    write_seconds: float = 0.0
+    evictions: int = 0
+
+    def __add__(self, other: CacheStats) -> CacheStats:
+        return CacheStats(
+            **{
+                field: getattr(self, field) + getattr(other, field)
+                for field in self.__fields__
+            }
+        )
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Return the share of partitions found in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    @property
+    def read_latency(self) -> Optional[float]:
+        """Return the average time to load a partition from disk, in seconds."""
+        return self.read_seconds / self.disk_reads if self.disk_reads else None
 
 
 class CacheManager(BaseModel):
-    """Manages card cache."""
+    """Manages card cache.
+
+    A partition holds every card of a query type printed in a set.
+    A set without any matching card is cached as an empty partition.
+
+    Partitions fetched more than ``ttl`` seconds ago are stale.
+    If ``ttl`` is ``None``, partitions never go stale.
+
+    Up to ``memory_size`` partitions are kept in memory.
+    Cards read from memory are shared between reads, and must not be mutated.
+
+    Partitions are written atomically, so concurrent processes can share the
+    cache.
+
+    If ``max_size`` is set, partitions are evicted once cached cards weigh
+    more than ``max_size`` bytes, following the ``eviction`` policy.
+    Partitions are only evicted when writing, and partitions being written are
+    never evicted.
+
+    `CacheManager.stats` counts operations of this instance.
+    Call `CacheManager.save_stats` to add them, and partition accesses used
+    by the eviction policy, to the totals stored in the cache, shared by
+    every process, and returned by `CacheManager.total_stats`.
+
+    Example::
+
+    ```python
+    >>> from pathlib import Path
+    >>> from tempfile import TemporaryDirectory
+    >>> from manabase.cache import CacheManager
+    >>> from manabase.cards import Card
+    >>> from manabase.query import QueryType
+    >>> card = Card.named("Tundra").copy(update={"set": "vma"})
+    >>> with TemporaryDirectory() as path:
+    ...     cache = CacheManager(Path(path))
+    ...     cache.write_cache(QueryType.land, ["vma", "2xm"], [card])
+    ...     cache.missing_sets(QueryType.land, ["vma", "2xm", "me4"])
+    ['me4']
+
+    ```
+    """
 
     path: Path
+    ttl: Optional[float]
+    memory_size: int
+    max_size: Optional[int]
+    eviction: EvictionPolicy
     _index: Index
+    _memory: LRUCache
+    _stats: CacheStats
+    _accesses: Dict[PartitionKey, Tuple[float, int]]
+    _stats_lock: threading.Lock
+
+    _PARTITION_PREFIX: str = "cards"
+    _INFO_PREFIX: str = "info"
+    _LOCK_PREFIX: str = "lock"
+    _ACCESS_PREFIX: str = "access"
+    _STATS_KEY: str = "stats"
 
-    _SETS_KEY: str = "sets"
+    TTL: ClassVar[float] = 7 * 24 * 60 * 60
+    MEMORY_SIZE: ClassVar[int] = 256
+    LOCK_EXPIRE: ClassVar[float] = 5 * 60
 
     class Config:  # pylint: disable=missing-class-docstring
         underscore_attrs_are_private = True
         arbitrary_types_allowed = True
 
-    def __init__(self, path: Optional[Path] = None) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = TTL,
+        memory_size: int = MEMORY_SIZE,
+        max_size: Optional[int] = None,
+        eviction: EvictionPolicy = EvictionPolicy.lru,
+    ) -> None:
         path = path or CacheManager.default_path()
 
-        super().__init__(path=path)
+        super().__init__(
+            path=path,
+            ttl=ttl,
+            memory_size=memory_size,
+            max_size=max_size,
+            eviction=eviction,
+        )
 
         self._index = self._create_index()
+        self._memory = LRUCache(maxsize=memory_size)
+        self._stats = CacheStats()
+        self._accesses = {}
+        self._stats_lock = threading.Lock()
 
     @staticmethod
     def default_path() -> Path:
         """Return a default cache directory"""
-        return Path(user_cache_dir(__app_name__, version=__version__))
+        return Path(user_cache_dir(__app_name__)) / "cards"
+
+    @classmethod
+    def prune_versions(cls) -> List[Path]:
+        """Remove the cache directories of older versions, one per package version.
+
+        Return the removed directories.
+        """
+        parent = cls.default_path().parent
+
+        if not parent.is_dir():
+            return []
+
+        removed = []
+
+        for path in parent.iterdir():
+            if path.is_dir() and _is_version(path.name):
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+
+        return removed
 
     def _create_index(self) -> Index:
         """Create a disk index."""
-        index = Index(str(self.path))
-        if self._SETS_KEY not in index:
-            index[self._SETS_KEY] = {}
-        return index
+        return Index(str(self.path))
 
     def has_cache(self, query: QueryType, sets: List[str]) -> bool:
-        """Return ``True`` if ``index`` has a card cache."""
-        try:
-            self._index[query]
-        except KeyError:
-            return False
+        """Return ``True`` if every set of ``sets`` is cached for ``query``.
+
+        Queries spanning every set (an empty ``sets`` list) are never cached.
+        """
+        return bool(sets) and not self.missing_sets(query, sets)
+
+    def missing_sets(
+        self,
+        query: QueryType,
+        sets: List[str],
+        record: bool = True,
+    ) -> List[str]:
+        """Return the sets of ``sets`` without a cached partition for ``query``.
+
+        Unless ``record`` is unset, the lookup counts as hits and misses in
+        `CacheManager.stats`.
+        """
+        missing = [
+            set_code
+            for set_code in sets
+            if self.partition_info(query, set_code) is None
+        ]
+
+        if record:
+            self._record(hits=len(sets) - len(missing), misses=len(missing))
+
+        return missing
+
+    def stale_sets(self, query: QueryType, sets: List[str]) -> List[str]:
+        """Return the sets of ``sets`` with a stale partition for ``query``."""
+        if self.ttl is None:
+            return []
+
+        expired_at = time.time() - self.ttl
+        stale = []
+
+        for set_code in sets:
+            info = self.partition_info(query, set_code)
+            if info is not None and info.fetched_at < expired_at:
+                stale.append(set_code)
+
+        return stale
+
+    def partition_info(
+        self, query: QueryType, set_code: str
+    ) -> Optional[PartitionInfo]:
+        """Return the metadata of a partition, or ``None`` if it is not cached.
+
+        Partitions written with another schema are not cached either.
+        """
+        info = self._load_info(self._info_key(query, set_code))
+
+        if info is None or info.schema_version != SCHEMA_VERSION:
+            return None
+
+        return info
+
+    def touch(self, query: QueryType, set_code: str):
+        """Mark a partition as fresh, once the server confirmed it did not change."""
+        with self._index.transact():
+            info = self.partition_info(query, set_code)
+
+            if info is not None:
+                info = info.copy(update={"fetched_at": time.time()})
+                self._index[self._info_key(query, set_code)] = info.dict()
+
+    def write_cache(  # pylint: disable=too-many-arguments
+        self,
+        query: QueryType,
+        sets: List[str],
+        cards: List[Card],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Write cards to the local cache, one partition per set of ``sets``.
+
+        ``cards`` must hold every card of ``query`` printed in ``sets``, and
+        are dispatched to partitions by their set code.
 
-        if set(sets).issubset(self._cached_sets(query)):
-            return True
+        ``etag`` and ``last_modified`` are stored as the partitions validators.
+        """
+        partitions: Dict[str, List[Card]] = defaultdict(list)
 
-        return False
+        for card in cards:
+            partitions[card.set].append(card)
 
-    def write_cache(self, query: QueryType, sets: List[str], cards: List[Card]):
-        """Write cards to the local cache."""
-        self._index[query] = cards
-        self._set_cached_sets(query, sets)
+        for set_code in sets:
+            start = time.perf_counter()
+            key = self._partition_key(query, set_code)
+            data = dump_cards(partitions[set_code])
+            info = PartitionInfo(
+                version=uuid4().hex,
+                fetched_at=time.time(),
+                size=len(data),
+                schema_version=SCHEMA_VERSION,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            # Cards and their metadata are written in a single transaction.
+            # Readers do not use one, so the version is still written last:
+            # they never see a version stamp without its cards.
+            with self._index.transact():
+                self._index[key] = data
+                self._index[self._info_key(query, set_code)] = info.dict()
+            self._memory.put(key, (info.version, partitions[set_code]))
 
-    def read_cache(self, query: QueryType) -> List[Card]:
-        """Read cards from the local cache."""
-        return self._index.get(query, [])
+            self._record(
+                writes=1,
+                bytes_written=len(data),
+                write_seconds=time.perf_counter() - start,
+            )
+
+        self._evict(keep={self._partition_key(query, set_code) for set_code in sets})
+
+    def load_partitions(self, partitions: Iterable[PartitionData]):
+        """Write serialized partitions, such as exported ones, in bulk.
+
+        Partitions are written in a single transaction, with their metadata.
+        Their version stamp and size are set again.
+        """
+        start = time.perf_counter()
+        keys = set()
+        size = 0
+
+        with self._index.transact():
+            for query, set_code, info, data in partitions:
+                key = self._partition_key(query, set_code)
+                info = info.copy(update={"version": uuid4().hex, "size": len(data)})
+                self._index[key] = data
+                self._index[self._info_key(query, set_code)] = info.dict()
+                keys.add(key)
+                size += len(data)
+
+        for key in keys:
+            self._memory.discard(key)
+
+        self._record(
+            writes=len(keys),
+            bytes_written=size,
+            write_seconds=time.perf_counter() - start,
+        )
+
+        self._evict(keep=keys)
+
+    def read_cache(self, query: QueryType, sets: List[str]) -> List[Card]:
+        """Read cards of ``sets`` from the local cache.
+
+        Cards printed in several sets are kept once, and sorted by name.
+        """
+        now = time.time()
+
+        with self._stats_lock:
+            for set_code in sets:
+                key = self._partition_key(query, set_code)
+                _, accesses = self._accesses.get(key, (now, 0))
+                self._accesses[key] = (now, accesses + 1)
+
+        return merge_cards(self._read_partition(query, set_code) for set_code in sets)
 
     def clear(self):
         """Clear the cache."""
         self._index.clear()
+        self._memory.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return the statistics of this instance not saved yet."""
+        return self._stats.copy()
+
+    def save_stats(self):
+        """Add the statistics of this instance to the totals stored in the cache."""
+        with self._stats_lock:
+            stats, self._stats = self._stats, CacheStats()
+            accesses, self._accesses = self._accesses, {}
+
+        if stats == CacheStats() and not accesses:
+            return
+
+        with self._index.transact():
+            totals = self._load_stats()
+            self._index[self._STATS_KEY] = (totals + stats).dict()
+
+            for key, access in accesses.items():
+                self._index[self._access_key(key)] = self._merge_access(key, access)
+
+    def total_stats(self) -> CacheStats:
+        """Return the statistics of every process, including unsaved ones."""
+        return self._load_stats() + self._stats
+
+    def iter_partitions(self) -> Iterator[Tuple[QueryType, str, PartitionInfo]]:
+        """Iterate over cached partitions, with their metadata."""
+        for query, set_code, info in self._iter_infos():
+            if info.schema_version == SCHEMA_VERSION:
+                yield query, set_code, info
+
+    def iter_partition_data(self) -> Iterator[PartitionData]:
+        """Iterate over cached partitions, with their metadata and serialized cards."""
+        for query, set_code, _ in self.iter_partitions():
+            # Read again in a transaction, so the cards match their metadata.
+            with self._index.transact():
+                info = self.partition_info(query, set_code)
+                data = self._index.get(self._partition_key(query, set_code))
+
+            if info is not None and data is not None:
+                yield query, set_code, info, data
+
+    def drop_incompatible(self) -> int:
+        """Drop partitions written with another schema, and return their count."""
+        dropped = 0
+
+        for query, set_code, info in self._iter_infos():
+            if info.schema_version != SCHEMA_VERSION:
+                self._drop_partition(query, set_code)
+                dropped += 1
+
+        return dropped
+
+    def _iter_infos(self) -> Iterator[Tuple[QueryType, str, PartitionInfo]]:
+        """Iterate over the metadata of every partition, whatever its schema."""
+        for key in list(self._index.keys()):
+
+            if not isinstance(key, tuple) or key[0] != self._INFO_PREFIX:
+                continue
+
+            _, query, set_code = key
+            info = self._load_info(key)
+
+            if info is not None:
+                yield QueryType(query), set_code, info
+
+    def _load_info(self, key: PartitionKey) -> Optional[PartitionInfo]:
+        try:
+            return PartitionInfo.parse_obj(self._index[key])
+        except (KeyError, ValidationError):
+            return None
+
+    def _load_stats(self) -> CacheStats:
+        try:
+            return CacheStats.parse_obj(self._index.get(self._STATS_KEY, {}))
+        except ValidationError:
+            return CacheStats()
+
+    def _evict(self, keep: Set[PartitionKey]):
+        """Evict partitions until cached cards fit in ``max_size``."""
+        if self.max_size is None:
+            return
+
+        self.drop_incompatible()
+        partitions = list(self.iter_partitions())
+        size = sum(info.size for _, _, info in partitions)
+
+        if size <= self.max_size:
+            return
+
+        with self._stats_lock:
+            pending = dict(self._accesses)
+
+        def priority(partition: Tuple[QueryType, str, PartitionInfo]):
+            query, set_code, info = partition
+            key = self._partition_key(query, set_code)
+            accessed_at, accesses = self._merge_access(
+                key,
+                pending.get(key, (info.fetched_at, 0)),
+            )
+            if self.eviction == EvictionPolicy.lfu:
+                return (accesses, accessed_at)
+            return (accessed_at, accesses)
+
+        for query, set_code, info in sorted(partitions, key=priority):
+
+            if size <= self.max_size:
+                break
+
+            if self._partition_key(query, set_code) in keep:
+                continue
+
+            self._drop_partition(query, set_code)
+            size -= info.size
+            self._record(evictions=1)
+
+    def _merge_access(
+        self,
+        key: PartitionKey,
+        access: Tuple[float, int],
+    ) -> Tuple[float, int]:
+        """Merge an access of this instance with the ones stored in the cache."""
+        accessed_at, accesses = self._index.get(self._access_key(key), (0.0, 0))
+        return max(accessed_at, access[0]), accesses + access[1]
+
+    def _record(self, **counters):
+        """Add ``counters`` to the statistics of this instance."""
+        with self._stats_lock:
+            self._stats = self._stats + CacheStats(**counters)
+
+    def _read_partition(self, query: QueryType, set_code: str) -> List[Card]:
+        """Read a partition from memory if it is up to date, else from disk."""
+        key = self._partition_key(query, set_code)
+
+        # The version is read first: if the partition is rewritten in between,
+        # the new cards are stored with the old version, and read again later.
+        info = self._load_info(self._info_key(query, set_code))
+
+        if info is None:
+            self._memory.discard(key)
+            return []
+
+        if info.schema_version != SCHEMA_VERSION:
+            self._drop_partition(query, set_code)
+            return []
+
+        cached = self._memory.get(key)
+
+        if cached is not None and cached[0] == info.version:
+            self._record(memory_hits=1)
+            return cached[1]
+
+        start = time.perf_counter()
+
+        try:
+            data = self._index[key]
+            cards = load_cards(data)
+        except (KeyError, UnsupportedFormat):
+            # Unreadable partitions are dropped, to be fetched again.
+            self._drop_partition(query, set_code)
+            return []
+
+        self._record(
+            disk_reads=1,
+            bytes_read=len(data),
+            read_seconds=time.perf_counter() - start,
+        )
+        self._memory.put(key, (info.version, cards))
+
+        return cards
+
+    def lock(self, query: QueryType, set_code: str) -> Lock:
+        """Return a lock on a partition, shared by every process using the cache.
+
+        Hold it while fetching a partition, so that concurrent processes
+        needing it wait for a single fetch.
+        Locks expire after `CacheManager.LOCK_EXPIRE` seconds, in case their
+        holder dies.
+        """
+        key = (self._LOCK_PREFIX, query.value, set_code)
+        return Lock(self._index.cache, key, expire=self.LOCK_EXPIRE)
+
+    def _drop_partition(self, query: QueryType, set_code: str):
+        key = self._partition_key(query, set_code)
+
+        with self._index.transact():
+            self._index.pop(self._info_key(query, set_code), None)
+            self._index.pop(key, None)
+            self._index.pop(self._access_key(key), None)
+        self._memory.discard(self._partition_key(query, set_code))
+
+    def _partition_key(self, query: QueryType, set_code: str) -> PartitionKey:
+        return (self._PARTITION_PREFIX, query.value, set_code)
+
+    def _info_key(self, query: QueryType, set_code: str) -> PartitionKey:
+        return (self._INFO_PREFIX, query.value, set_code)
+
+    def _access_key(self, key: PartitionKey) -> PartitionKey:
+        _, query, set_code = key
+        return (self._ACCESS_PREFIX, query, set_code)
 
-    def _cached_sets(self, query: QueryType) -> Set[str]:
-        return self._index.get(self._SETS_KEY, {}).get(query, set())
 
-    def _set_cached_sets(self, query: QueryType, sets: List[str]):
-        cached_sets = self._index.get(self._SETS_KEY, {})
-        cached_sets[query] = cached_sets.get(query, set()).union(sets)
-        self._index[self._SETS_KEY] = cached_sets
+def _is_version(name: str) -> bool:
+    """Return ``True`` for a version directory name, such as ``0.1.0``."""
+    return re.fullmatch(r"\d+(\.\d+)*", name) is not None
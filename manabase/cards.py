@@ -7,9 +7,24 @@ and artwork related data, price data, etc...
 from __future__ import annotations
 
 from functools import total_ordering
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from pydantic import BaseModel  # pylint: disable=no-name-in-module
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+    PrivateAttr,
+)
 
 
 @total_ordering
@@ -17,6 +32,11 @@ class Card(BaseModel):
     """A single card data.
 
     Only relevant data is shown here, and is parsed from a scryfall API response.
+
+    Cards are identified by their scryfall ``id``, a printing of the card, or
+    by their ``oracle_id`` and ``set`` if they have no ``id``, else by their
+    ``name`` and ``set``. The identity and its hash are computed once, so that
+    cards are cheap to compare, and to use in sets or as dict keys.
     """
 
     name: str
@@ -28,6 +48,35 @@ class Card(BaseModel):
     textless: bool
     scryfall_uri: str
     set: str
+    id: str = ""
+    oracle_id: str = ""
+
+    _identity: Hashable = PrivateAttr()
+    _hash: int = PrivateAttr()
+
+    IDENTITY_FIELDS: ClassVar[Tuple[str, ...]] = ("id", "oracle_id", "name", "set")
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._update_identity()
+
+    @classmethod
+    def construct(cls, _fields_set=None, **values: Any) -> Card:
+        """Create a card without validation, see `BaseModel.construct`."""
+        card = super().construct(_fields_set, **values)
+        card._update_identity()  # pylint: disable=protected-access
+        return card
+
+    @property
+    def identity(self) -> Hashable:
+        """Value identifying this card."""
+        return self._identity
+
+    def copy(self, *args, **kwargs) -> Card:
+        """Duplicate this card, see `BaseModel.copy`."""
+        card = super().copy(*args, **kwargs)
+        card._update_identity()  # pylint: disable=protected-access
+        return card
 
     @classmethod
     def named(cls, name: str) -> Card:
@@ -44,18 +93,193 @@ class Card(BaseModel):
             set="",
         )
 
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+
+        if name in self.IDENTITY_FIELDS:
+            self._update_identity()
+
+    def __setstate__(self, state: Dict):
+        super().__setstate__(state)
+        self._update_identity()
+
     def __hash__(self) -> int:
-        return hash(self.json())
+        return self._hash
 
     def __str__(self) -> str:
         return self.name
 
-    def __eq__(self, other: Card) -> bool:
-        return self.json() == other.json()
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self._identity == other._identity
 
     def __lt__(self, other: Card) -> bool:
         return self.name < other.name
 
+    def _update_identity(self):
+        self._identity = _identity(self.id, self.oracle_id, self.name, self.set)
+        self._hash = hash(self._identity)
+
+
+@total_ordering
+class CardRecord:  # pylint: disable=too-many-instance-attributes
+    """An immutable card, lighter than a `Card` model.
+
+    `Card` models are used by card sources, the cache and the API, whereas
+    records are used while filtering cards: they skip validation, have no
+    ``__dict__``, and store lists as tuples.
+
+    Records have the same identity as the card they were built from.
+
+    Example::
+
+    ```python
+    >>> from manabase.cards import Card, CardRecord
+    >>> record = CardRecord.from_card(Card.named("Tundra"))
+    >>> record.name
+    'Tundra'
+    >>> record.to_card() == Card.named("Tundra")
+    True
+    >>> record.name = "Plains"
+    Traceback (most recent call last):
+    ...
+    AttributeError: CardRecord is immutable.
+
+    ```
+    """
+
+    FIELDS: ClassVar[Tuple[str, ...]] = tuple(Card.__fields__)
+
+    __slots__ = FIELDS + ("_identity", "_hash")
+
+    name: str
+    oracle_text: str
+    colors: Tuple[str, ...]
+    color_identity: Tuple[str, ...]
+    produced_mana: Tuple[str, ...]
+    legalities: Mapping[str, str]
+    textless: bool
+    scryfall_uri: str
+    set: str
+    id: str
+    oracle_id: str
+    _identity: Hashable
+    _hash: int
+
+    def __init__(self, **values: Any):
+        identity = _identity(
+            values["id"], values["oracle_id"], values["name"], values["set"]
+        )
+        self._assign(values, identity)
+
+    @classmethod
+    def from_card(cls, card: Card) -> CardRecord:
+        """Build a record from a `Card` model."""
+        values = dict(card.__dict__)
+        values["colors"] = tuple(values["colors"])
+        values["color_identity"] = tuple(values["color_identity"])
+        values["produced_mana"] = tuple(values["produced_mana"])
+        values["legalities"] = MappingProxyType(values["legalities"])
+
+        # The identity of the card is reused, instead of computed again.
+        record = object.__new__(cls)
+        record._assign(values, card.identity)  # pylint: disable=protected-access
+        return record
+
+    def to_card(self) -> Card:
+        """Build a `Card` model from this record."""
+        return Card.construct(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields of this record, as they are in a `Card` model."""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values["colors"] = list(self.colors)
+        values["color_identity"] = list(self.color_identity)
+        values["produced_mana"] = list(self.produced_mana)
+        values["legalities"] = dict(self.legalities)
+        return values
+
+    @property
+    def identity(self) -> Hashable:
+        """Value identifying this card."""
+        return self._identity
+
+    def _assign(self, values: Dict[str, Any], identity: Hashable):
+        setattr_ = object.__setattr__
+
+        for field in self.FIELDS:
+            setattr_(self, field, values[field])
+
+        setattr_(self, "_identity", identity)
+        setattr_(self, "_hash", hash(identity))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("CardRecord is immutable.")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("CardRecord is immutable.")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (Card, CardRecord)):
+            return NotImplemented
+        return self._identity == other.identity
+
+    def __lt__(self, other: AnyCard) -> bool:
+        return self.name < other.name
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"CardRecord({fields})"
+
+
+AnyCard = Union[Card, CardRecord]
+
+
+def _identity(
+    id_: str,
+    oracle_id: str,
+    name: str,
+    set_code: str,
+) -> Hashable:
+    """Return the identity of a card, see `Card`."""
+    if id_:
+        return id_
+    return (oracle_id or name, set_code)
+
+
+def merge_cards(results: Iterable[Iterable[Card]]) -> List[Card]:
+    """Merge the results of several queries into a single list.
+
+    Scryfall returns a single printing of each card per query, so cards
+    found by several queries are kept once, and the list is sorted by name,
+    like a scryfall search result.
+
+    Example::
+
+    ```python
+    >>> from manabase.cards import Card, merge_cards
+    >>> results = [[Card.named("b"), Card.named("c")], [Card.named("a"), \
+Card.named("b")]]
+    >>> [card.name for card in merge_cards(results)]
+    ['a', 'b', 'c']
+
+    ```
+    """
+    cards: Dict[str, Card] = {}
+
+    for result in results:
+        for card in result:
+            cards.setdefault(card.name, card)
+
+    return sorted(cards.values())
+
 
 class MaximumSizeExceeded(Exception):
     """Raised when the maximum number of occurrences has been exceeded."""
@@ -84,7 +308,7 @@ class CardList(BaseModel):
             entries_by_name={},
         )
 
-    def add_card(self, card: Card, occurrences: int):
+    def add_card(self, card: AnyCard, occurrences: int):
         """Add a new card to this card list.
 
         Raises:
@@ -99,7 +323,8 @@ class CardList(BaseModel):
         existing = self.by_name(card.name)
 
         if not existing:
-            entry = CardEntry(occurrences=0, **card.dict())
+            fields = card.to_dict() if isinstance(card, CardRecord) else card.dict()
+            entry = CardEntry(occurrences=0, **fields)
             self.entries_by_name[entry.name] = entry
             self.entries.append(entry)
             existing = entry
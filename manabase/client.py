@@ -1,23 +1,166 @@
 """Fetch data from [scryfall](https://scryfall.com/)."""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from queue import Empty, Full, Queue
+from typing import Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union
 
 import requests
-from pydantic import ValidationError
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
+from . import __app_name__, __version__
 from .cache import CacheManager
-from .cards import Card
+from .cards import Card, merge_cards
+from .decoding import decode_cards
 from .query import SetQueryBuilder
+from .ratelimit import RateLimiter
+from .source import CardSource
+
+Timeout = Union[float, Tuple[float, float]]
+
+ItemType = TypeVar("ItemType")
+
+
+class RetryPolicy(BaseModel):
+    """Decides when and how long to wait before retrying a failed request.
+
+    Delays grow exponentially with each attempt, and are fully jittered so
+    that concurrent clients do not retry in lockstep.
+
+    A ``Retry-After`` header sent by the server always takes precedence.
+
+    Example::
+
+    ```python
+    >>> from manabase.client import RetryPolicy
+    >>> policy = RetryPolicy(backoff_factor=1.0, backoff_max=4.0)
+    >>> 0 <= policy.delay(10) <= 4.0
+    True
+    >>> policy.delay(0, retry_after="2")
+    2.0
+
+    ```
+    """
+
+    retries: int = 5
+    backoff_factor: float = 0.5
+    backoff_max: float = 30.0
+    statuses: Set[int] = {429, 500, 502, 503, 504}
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Return the number of seconds to wait before retry number ``attempt``."""
+        if retry_after:
+            seconds = self._parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.backoff_max)
+
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> Optional[float]:
+        """Parse a ``Retry-After`` header, either in seconds or as an HTTP date."""
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return max(0.0, date.timestamp() - time.time())
+
 
+class Client(CardSource):  # pylint: disable=too-many-instance-attributes
+    """A client for the scryfall API.
 
-class Client:
-    """A client for the scryfall API."""
+    The client owns a pooled HTTP session, so connections are kept alive
+    and reused across pages and queries.
+    Call `Client.close` (or use the client as a context manager) to release them.
+
+    With ``prefetch`` enabled, the next page is downloaded by a background
+    thread while cards of the current page are validated and filtered.
+
+    Requests are throttled by a `RateLimiter`, which can be shared between
+    several clients.
+
+    `Client.fetch` can split queries into per-set shards, downloaded in
+    parallel by up to ``jobs`` threads.
+
+    Stale cached sets are served as is, while up to ``jobs`` background
+    threads check with the server whether they changed, and download them
+    again if they did.
+    `Client.close` waits for these refreshes to finish.
+    """
 
     API_URL = "https://api.scryfall.com"
+    TIMEOUT: Timeout = (3.05, 30.0)
+    POOL_SIZE = 10
 
-    def __init__(self, api_url: str = API_URL, cache: Optional[CacheManager] = None):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        api_url: str = API_URL,
+        cache: Optional[CacheManager] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Timeout = TIMEOUT,
+        retry: Optional[RetryPolicy] = None,
+        prefetch: bool = False,
+        limiter: Optional[RateLimiter] = None,
+        jobs: int = 4,
+    ):
         self.api_url = api_url
         self.cache = cache
+        self.session = session or self._create_session()
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.prefetch = prefetch
+        self.limiter = limiter or RateLimiter()
+        self.jobs = jobs
+
+        self._refresher = ThreadPoolExecutor(max_workers=jobs)
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._refreshing_lock = threading.Lock()
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Wait for background refreshes, then close pooled connections."""
+        self._refresher.shutdown(wait=True)
+        self.session.close()
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        """Create a keep-alive session with a connection pool."""
+        session = requests.Session()
+        session.headers.update(
+            {
+                "Accept": "application/json",
+                "User-Agent": f"{__app_name__}/{__version__}",
+            }
+        )
+
+        # Retries are handled by `Client._get`, to honor ``Retry-After``.
+        adapter = HTTPAdapter(
+            pool_connections=cls.POOL_SIZE,
+            pool_maxsize=cls.POOL_SIZE,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
 
     def route(self, path: str) -> str:
         """Build an URL endpoint from a relative path.
@@ -32,53 +175,463 @@ class Client:
         """
         return "/".join([self.api_url, path])
 
-    def fetch(self, builder: SetQueryBuilder) -> List[Card]:
-        """Fetch a filtered list of cards."""
-        if self.cache and self.cache.has_cache(builder.type, builder.sets):
-            return self.cache.read_cache(builder.type)
+    def fetch(
+        self,
+        builder: SetQueryBuilder,
+        shard_size: Optional[int] = None,
+    ) -> List[Card]:
+        """Fetch a filtered list of cards.
+
+        If ``shard_size`` is set, the query is split into sub-queries of
+        ``shard_size`` sets, fetched in parallel then merged.
+        """
+        if (
+            shard_size is None
+            or len(builder.sets) <= shard_size
+            or self.from_cache(builder)
+        ):
+            return list(self.iter_cards(builder))
+
+        return merge_cards(self._fetch_shards(builder, shard_size))
+
+    def iter_cards(self, builder: SetQueryBuilder) -> Iterator[Card]:
+        """Iterate over a filtered list of cards.
+
+        Cards are yielded page by page as soon as they are validated, following
+        scryfall ``next_page`` cursor until the last page.
 
-        query = builder.build()
+        If the query is served from the cache, sets missing from the cache are
+        fetched one per query, in parallel, and cached before cards are read
+        back from the cache. Stale sets are refreshed in the background.
+        """
+        if not self.from_cache(builder):
+            yield from self._iter_cards(builder.build())
+            return
+
+        assert self.cache is not None
+
+        # The cache holds full card pools, a pushdown is left to filters.
+        builder = builder.copy(update={"pushdown": None})
+
+        self.fill(builder, self.cache.missing_sets(builder.type, builder.sets))
+        self.refresh(builder, self.cache.stale_sets(builder.type, builder.sets))
+
+        yield from self.cache.read_cache(builder.type, builder.sets)
+
+    def fill(self, builder: SetQueryBuilder, sets: List[str]):
+        """Fetch ``sets`` of ``builder`` in parallel, one per query, and cache them."""
+        for _ in self.iter_fill(builder, sets):
+            pass
+
+    def iter_fill(
+        self,
+        builder: SetQueryBuilder,
+        sets: List[str],
+    ) -> Iterator[Tuple[str, int]]:
+        """Fill the cache like `Client.fill`, yielding sets as they are cached.
+
+        Each set is yielded with its number of cards, in completion order.
+        Sets are cached as soon as they are fetched, so an interrupted fill
+        keeps the sets it already fetched.
+        """
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(self._update_set, builder, set_code): set_code
+                for set_code in sets
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], len(future.result() or [])
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def refresh(self, builder: SetQueryBuilder, sets: List[str]):
+        """Revalidate cached ``sets`` of ``builder`` in background threads.
+
+        Sets already being refreshed are skipped.
+        """
+        for set_code in sets:
+
+            key = (builder.type.value, set_code)
+
+            with self._refreshing_lock:
+                if key in self._refreshing:
+                    continue
+                self._refreshing.add(key)
+
+            future = self._refresher.submit(
+                self._update_set,
+                builder,
+                set_code,
+                conditional=True,
+            )
+            # Failed refreshes are retried the next time the set is read.
+            future.add_done_callback(lambda _, key=key: self._refreshed(key))
+
+    def _refreshed(self, key: Tuple[str, str]):
+        with self._refreshing_lock:
+            self._refreshing.discard(key)
 
-        cards = self._fetch_cards(query)
+    def _update_set(
+        self,
+        builder: SetQueryBuilder,
+        set_code: str,
+        conditional: bool = False,
+    ) -> Optional[List[Card]]:
+        """Fetch a single set of ``builder`` into the cache.
 
-        if self.cache is not None:
-            self.cache.write_cache(builder.type, builder.sets, cards)
+        If ``conditional`` is set, the validators of the cached partition are
+        sent, and the partition is only marked as fresh if it did not change.
+
+        Return the fetched cards, or ``None`` if the partition did not change.
+
+        Processes sharing the cache fetch a set one at a time: once the lock is
+        acquired, a set fetched or refreshed by another process is skipped.
+        """
+        assert self.cache is not None
+
+        with self.cache.lock(builder.type, set_code):
+
+            if conditional:
+                if not self.cache.stale_sets(builder.type, [set_code]):
+                    return None
+            elif not self.cache.missing_sets(builder.type, [set_code], record=False):
+                return self.cache.read_cache(builder.type, [set_code])
+
+            return self._fetch_set(builder, set_code, conditional)
+
+    def _fetch_set(
+        self,
+        builder: SetQueryBuilder,
+        set_code: str,
+        conditional: bool,
+    ) -> Optional[List[Card]]:
+        assert self.cache is not None
+
+        headers: Dict[str, str] = {}
+        info = self.cache.partition_info(builder.type, set_code)
+
+        if conditional and info is not None:
+            if info.etag:
+                headers["If-None-Match"] = info.etag
+            if info.last_modified:
+                headers["If-Modified-Since"] = info.last_modified
+
+        query = builder.copy(update={"sets": [set_code]}).build()
+        response = self._get(
+            self.route("cards/search"),
+            params={"q": query},
+            headers=headers,
+        )
+
+        if response.status_code == 304:
+            self.cache.touch(builder.type, set_code)
+            return None
+
+        cards: List[Card] = []
+        # Scryfall answers searches without any match with a 404.
+        data = None if response.status_code == 404 else response.json()
+
+        while data is not None:
+            cards.extend(decode_cards(data["data"]))
+            data = self.fetch_page(data["next_page"]) if data["has_more"] else None
+
+        self.cache.write_cache(
+            builder.type,
+            [set_code],
+            cards,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
 
         return cards
 
-    def _fetch_cards(self, query: str) -> List[Card]:
-        data = self._fetch_all_pages(query)
-        cards = []
+    def cacheable(self, builder: SetQueryBuilder) -> bool:
+        """Return ``True`` if results of ``builder`` can be written to the cache.
 
-        for obj in data:
+        Queries narrowed down by a pushdown only return a part of the card pool,
+        and queries without sets cannot be partitioned, so they are never cached.
+        """
+        return (
+            self.cache is not None and builder.pushdown is None and bool(builder.sets)
+        )
 
-            if "produced_mana" not in obj:
-                # Fetch lands don't have the ``produced_mana`` field.
-                obj.update({"produced_mana": []})
+    def from_cache(self, builder: SetQueryBuilder) -> bool:
+        """Return ``True`` if cards of ``builder`` are read from the cache.
+
+        Cacheable queries are, once their missing sets are fetched. Queries
+        narrowed down by a pushdown are too, when every set of their full card
+        pool is already cached.
+        """
+        if self.cacheable(builder):
+            return True
+
+        return (
+            self.cache is not None
+            and bool(builder.sets)
+            and not self.cache.missing_sets(builder.type, builder.sets, record=False)
+        )
+
+    def _fetch_shards(
+        self,
+        builder: SetQueryBuilder,
+        shard_size: int,
+    ) -> List[List[Card]]:
+        """Fetch the shards of ``builder`` in parallel, in order."""
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            return list(
+                executor.map(
+                    lambda shard: list(self._iter_cards(shard.build())),
+                    builder.split(shard_size),
+                )
+            )
+
+    def _iter_cards(self, query: str) -> Iterator[Card]:
+        pages = self._iter_pages(query)
+
+        if self.prefetch:
+            pages = _prefetch(pages)
+
+        for page in pages:
+            yield from decode_cards(page)
+
+    def fetch_page(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Fetch a single page of search results.
+
+        Return ``None`` if the search did not match any card.
+        """
+        response = self._get(url, params=params)
+
+        if response.status_code == 404:
+            # Scryfall answers searches without any match with a 404.
+            return None
+
+        return response.json()
+
+    def _iter_pages(self, query: str) -> Iterator[List[Dict]]:
+        """Iterate over pages of a search, draining paginated content."""
+        url: Optional[str] = self.route("cards/search")
+        params: Optional[Dict] = {"q": query}
+
+        while url is not None:
+
+            data = self.fetch_page(url, params=params)
+
+            if data is None:
+                return
+
+            yield data["data"]
+
+            if not data["has_more"]:
+                return
+
+            # The cursor already contains the query parameters.
+            url, params = data["next_page"], None
+
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """Send a GET request, retrying on connection errors and retryable statuses.
+
+        Raises:
+            requests.RequestException: When retries are exhausted, or the server
+                answers with a non retryable error status.
+        """
+        attempt = 0
+
+        while True:
 
             try:
-                model = Card(**obj)
-            except ValidationError:
+                with self.limiter.request() as permit:
+                    response = self.session.get(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=self.timeout,
+                    )
+                    permit.throttled = response.status_code == 429
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retry.retries:
+                    raise
+                self._sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if (
+                response.status_code in self.retry.statuses
+                and attempt < self.retry.retries
+            ):
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self._sleep(self.retry.delay(attempt, retry_after))
+                attempt += 1
                 continue
 
-            cards.append(model)
+            if response.status_code != 404:
+                response.raise_for_status()
+
+            return response
+
+    @staticmethod
+    def _sleep(delay: float):
+        """Wait ``delay`` seconds before retrying a request."""
+        time.sleep(delay)
+
+
+class AsyncClient:
+    """An asyncio client for the scryfall API.
+
+    It has the same contract as `Client`, but lets several queries, and their
+    pages, run concurrently.
+
+    Blocking requests are sent by the wrapped `Client` from executor threads,
+    so connections, the cache and the rate limiter are shared with it.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.client = client or Client()
+
+    @property
+    def cache(self) -> Optional[CacheManager]:
+        """Return the cache of the wrapped client."""
+        return self.client.cache
+
+    async def fetch(
+        self,
+        builder: SetQueryBuilder,
+        shard_size: Optional[int] = None,
+    ) -> List[Card]:
+        """Fetch a filtered list of cards.
+
+        If ``shard_size`` is set, the query is split into sub-queries of
+        ``shard_size`` sets, fetched concurrently then merged.
+        """
+        # The cache is read from disk, so it is used from an executor too.
+        loop = asyncio.get_running_loop()
+
+        if await loop.run_in_executor(None, self.client.from_cache, builder):
+            return await loop.run_in_executor(None, self.client.fetch, builder)
+
+        if shard_size is None or len(builder.sets) <= shard_size:
+            return await self._fetch_query(builder.build())
+
+        return merge_cards(await self._fetch_shards(builder, shard_size))
+
+    async def _fetch_shards(
+        self,
+        builder: SetQueryBuilder,
+        shard_size: int,
+    ) -> List[List[Card]]:
+        """Fetch the shards of ``builder`` concurrently, in order."""
+        return await asyncio.gather(
+            *[self._fetch_query(shard.build()) for shard in builder.split(shard_size)]
+        )
+
+    async def _fetch_query(self, query: str) -> List[Card]:
+        """Fetch all pages of a query.
+
+        If the wrapped client has ``prefetch`` enabled, the next page is
+        requested before cards of the current page are decoded.
+        """
+        cards: List[Card] = []
+
+        data = await self._fetch_page(self.client.route("cards/search"), {"q": query})
+
+        while data is not None:
+
+            next_page = None
+
+            if data["has_more"] and self.client.prefetch:
+                next_page = self._fetch_page(data["next_page"], None)
+
+            cards.extend(decode_cards(data["data"]))
+
+            if data["has_more"] and next_page is None:
+                # The cursor already contains the query parameters.
+                next_page = self._fetch_page(data["next_page"], None)
+
+            data = None if next_page is None else await next_page
 
         return cards
 
-    def _fetch_all_pages(self, query: str, page: int = 1) -> List[Dict]:
-        """Fetch all pages, draining paginated content."""
-        params = {"q": query, "page": page}
-        response = requests.get(self.route("cards/search"), params=params)
+    def _fetch_page(
+        self,
+        url: str,
+        params: Optional[Dict],
+    ) -> asyncio.Future[Optional[Dict]]:
+        """Start fetching a page from an executor thread."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self.client.fetch_page, url, params)
 
-        data = response.json()
 
-        objects: List[Dict] = data["data"]
+class _Raised:  # pylint: disable=too-few-public-methods
+    """Wraps an exception raised by a prefetching thread."""
 
-        if data["has_more"]:
-            # Go easy on scryfall servers.
-            time.sleep(0.1)
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+def _prefetch(iterator: Iterator[ItemType], depth: int = 1) -> Iterator[ItemType]:
+    """Drain ``iterator`` in a background thread, ``depth`` items ahead.
+
+    Exceptions raised by ``iterator`` are raised again in the consumer thread.
+    Closing the returned generator stops the background thread.
+
+    Example::
+
+    ```python
+    >>> from manabase.client import _prefetch
+    >>> list(_prefetch(iter(range(3))))
+    [0, 1, 2]
+
+    ```
+    """
+    items: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except BaseException as error:  # pylint: disable=broad-except
+            put(_Raised(error))
+            return
+        put(_DONE)
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            try:
+                item = items.get(timeout=0.1)
+            except Empty:
+                if not worker.is_alive() and items.empty():
+                    return
+                continue
 
-            next_objects: List[Dict] = self._fetch_all_pages(query, page + 1)
-            objects.extend(next_objects)
+            if item is _DONE:
+                return
+            if isinstance(item, _Raised):
+                raise item.error
 
-        return objects
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,85 @@
+"""Decode scryfall card objects into `Card` models.
+
+Scryfall card objects carry many fields we do not use, such as prices, image
+URIs or artist data.
+Objects are first projected down to `Card` fields, then either:
+
+- Validated, for untrusted data such as API responses.
+- Constructed without validation, for trusted data such as our own cache or
+  bulk data snapshots.
+
+Example::
+
+```python
+>>> from manabase.decoding import decode_card
+>>> obj = {
+...     "name": "Tundra",
+...     "oracle_text": "({T}: Add {W} or {U}.)",
+...     "colors": [],
+...     "color_identity": ["W", "U"],
+...     "produced_mana": ["W", "U"],
+...     "legalities": {"vintage": "legal"},
+...     "textless": False,
+...     "scryfall_uri": "",
+...     "set": "vma",
+...     "prices": {"usd": "500.00"},
+... }
+>>> decode_card(obj)
+Card(name='Tundra', ...)
+>>> decode_card(obj, trusted=True)
+Card(name='Tundra', ...)
+>>> decode_card({"name": "Tundra"}) is None
+True
+
+```
+"""
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .cards import Card
+
+CARD_FIELDS: Tuple[str, ...] = tuple(Card.__fields__)
+REQUIRED_FIELDS: Tuple[str, ...] = tuple(
+    name for name, field in Card.__fields__.items() if field.required
+)
+
+
+def project(obj: Dict) -> Dict:
+    """Return a copy of ``obj`` holding only `Card` fields."""
+    data = {field: obj[field] for field in CARD_FIELDS if field in obj}
+
+    if "produced_mana" not in data:
+        # Fetch lands don't have the ``produced_mana`` field.
+        data["produced_mana"] = []
+
+    return data
+
+
+def decode_card(obj: Dict, trusted: bool = False) -> Optional[Card]:
+    """Decode a scryfall card object, or return ``None`` if it is invalid.
+
+    Trusted objects are not validated, only checked for missing fields.
+    """
+    data = project(obj)
+
+    if not trusted:
+        try:
+            return Card(**data)
+        except ValidationError:
+            return None
+
+    if any(field not in data for field in REQUIRED_FIELDS):
+        return None
+
+    return Card.construct(**data)
+
+
+def decode_cards(objects: Iterable[Dict], trusted: bool = False) -> Iterator[Card]:
+    """Decode scryfall card objects, skipping invalid ones."""
+    for obj in objects:
+
+        card = decode_card(obj, trusted)
+
+        if card is not None:
+            yield card
@@ -0,0 +1,56 @@
+"""Atomic file writes."""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Tuple
+from uuid import uuid4
+
+
+@contextmanager
+def replace_file(path: Path) -> Iterator[IO[bytes]]:
+    """Write a file next to ``path``, then move it over ``path``.
+
+    An interrupted write never leaves a truncated file at ``path``.
+
+    The file is created with the permissions of any new file, as allowed by the
+    umask, to be shared with other users.
+
+    Example::
+
+    ```python
+    >>> from pathlib import Path
+    >>> from tempfile import TemporaryDirectory
+    >>> from manabase.files import replace_file
+    >>> with TemporaryDirectory() as directory:
+    ...     with replace_file(Path(directory) / "data") as handle:
+    ...         _ = handle.write(b"data")
+    ...     (Path(directory) / "data").read_bytes()
+    b'data'
+
+    ```
+    """
+    temporary_path, handle = _open_temporary(path)
+
+    with handle:
+        try:
+            yield handle
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    os.replace(temporary_path, path)
+
+
+def _open_temporary(path: Path) -> Tuple[Path, IO[bytes]]:
+    while True:
+        temporary_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        try:
+            # Unlike ``tempfile``, the umask applies to the mode of the file.
+            descriptor = os.open(
+                temporary_path,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                0o666,
+            )
+        except FileExistsError:
+            continue
+        return temporary_path, os.fdopen(descriptor, "wb")
@@ -1,14 +1,16 @@
 """Filter management."""
 from __future__ import annotations
 
-from typing import List
+from itertools import islice
+from typing import ClassVar, Iterable, List
 
 from pydantic import BaseModel
 
-from ..cards import Card
+from ..cards import AnyCard, CardRecord
 from ..colors import Color
 from ..filters.base import FilterResult
 from ..filters.composite import CompositeFilter
+from ..table import CardTable
 
 
 class FilterManager(BaseModel):
@@ -17,15 +19,29 @@ class FilterManager(BaseModel):
     colors: List[Color]
     filters: CompositeFilter
 
-    def filter_cards(self, cards: List[Card]) -> List[FilterResult]:
-        """Filter a list of cards."""
-        results = []
+    CHUNK_SIZE: ClassVar[int] = 4096
 
-        for card in cards:
+    def filter_cards(self, cards: Iterable[AnyCard]) -> List[FilterResult]:
+        """Filter a list of cards.
 
-            res = self.filters.filter_card(card)
+        ``cards`` is consumed lazily, so it can be a stream of cards.
+        `Card` models are converted to records, so results hold `CardRecord`
+        objects.
+        Cards are gathered into a `CardTable` of up to ``CHUNK_SIZE`` cards at a
+        time, filtered all at once by `CardFilter.accept_batch`, so that memory
+        does not grow with the card pool.
+        """
+        records = (
+            card if isinstance(card, CardRecord) else CardRecord.from_card(card)
+            for card in cards
+        )
+        results: List[FilterResult] = []
 
-            if res.accepted_by is not None:
-                results.append(res)
+        while True:
 
-        return results
+            table = CardTable(islice(records, self.CHUNK_SIZE))
+
+            if not table:
+                return results
+
+            results.extend(self.filters.accept_batch(table).results(table))
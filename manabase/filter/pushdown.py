@@ -0,0 +1,404 @@
+"""Translate filter trees into scryfall search syntax.
+
+Filters are applied locally, once cards are downloaded.
+Translating them into a scryfall query lets the server discard most cards
+before they are sent.
+
+A translated query matches a superset of the cards accepted by the filter:
+the local filters still run afterwards for exactness, so a filter that cannot
+be translated simply does not constrain the search.
+
+Example::
+
+```python
+>>> from manabase.colors import Color
+>>> from manabase.filter.pushdown import translate_filter
+>>> from manabase.filters.colors import ProducedManaFilter
+>>> from manabase.filters.lands.original import OriginalDualLandFilter
+>>> from manabase.filters.set import CardSetFilter
+>>> filters = CardSetFilter(sets=["vma"]) & (
+...     ProducedManaFilter(colors=[Color.white, Color.blue])
+...     & OriginalDualLandFilter()
+... )
+>>> translate_filter(filters)
+'set:vma (produces:w or produces:u) -produces:b -produces:r -produces:g \
+fo:"({T}: Add"'
+
+```
+"""
+from typing import Collection, List, NamedTuple, Optional
+
+from ..colors import Color
+from ..filters.base import CardFilter
+from ..filters.colors import BasicLandReferencedFilter, ProducedManaFilter
+from ..filters.composite import (
+    AndOperator,
+    InvertOperator,
+    OrOperator,
+    XorOperator,
+)
+from ..filters.set import CardSetFilter
+from ..filters.text import CardTextFilter
+
+MINIMUM_LITERAL_LENGTH = 3
+
+_QUANTIFIERS = "?*+{"
+_OPTIONAL_QUANTIFIERS = "?*{"
+
+
+class Translation(NamedTuple):
+    """A scryfall query matching at least the cards accepted by a filter.
+
+    If ``exact`` is ``True``, it matches exactly these cards, and can be negated.
+    """
+
+    query: str
+    exact: bool
+
+
+# Matches every card of the search.
+_EVERY = Translation("", exact=True)
+
+
+def translate_filter(
+    filter_: CardFilter,
+    sets: Collection[str] = (),
+) -> Optional[str]:
+    """Return a scryfall query matching a superset of the cards ``filter_`` accepts.
+
+    ``sets`` are the sets the search is already restricted to: set filters
+    covering all of them accept every card, and are left out of the query.
+
+    Return ``None`` if the filter cannot narrow the search down.
+
+    Example::
+
+    ```python
+    >>> from manabase.filter.pushdown import translate_filter
+    >>> from manabase.filters.lands.original import OriginalDualLandFilter
+    >>> from manabase.filters.set import CardSetFilter
+    >>> filters = CardSetFilter(sets=["vma", "me4"]) & OriginalDualLandFilter()
+    >>> translate_filter(filters, sets=["vma"])
+    'fo:"({T}: Add"'
+
+    ```
+    """
+    translation = _translate(filter_, set(sets))
+
+    if translation is None or translation is _EVERY:
+        return None
+
+    return translation.query
+
+
+def _translate(  # pylint: disable=too-many-return-statements
+    filter_: CardFilter,
+    sets: Collection[str],
+) -> Optional[Translation]:
+    if isinstance(filter_, AndOperator):
+        return _and(_translate(filter_.left, sets), _translate(filter_.right, sets))
+
+    if isinstance(filter_, OrOperator):
+        return _or(_translate(filter_.left, sets), _translate(filter_.right, sets))
+
+    if isinstance(filter_, XorOperator):
+        return _xor(_translate(filter_.left, sets), _translate(filter_.right, sets))
+
+    if isinstance(filter_, InvertOperator):
+        return _not(_translate(filter_.leaf, sets))
+
+    if isinstance(filter_, CardSetFilter):
+        return _translate_sets(filter_, sets)
+
+    if isinstance(filter_, ProducedManaFilter):
+        return _translate_produced_mana(filter_)
+
+    if isinstance(filter_, BasicLandReferencedFilter):
+        return _translate_basic_land_references(filter_)
+
+    if isinstance(filter_, CardTextFilter):
+        return _translate_text(filter_)
+
+    return None
+
+
+def _and(
+    left: Optional[Translation],
+    right: Optional[Translation],
+) -> Optional[Translation]:
+    if left is _EVERY:
+        return right
+    if right is _EVERY:
+        return left
+
+    if left is None or right is None:
+        # An untranslated side does not constrain the search, but the
+        # result is no longer exact.
+        remaining = left or right
+        if remaining is None:
+            return None
+        return Translation(remaining.query, exact=False)
+
+    return Translation(f"{left.query} {right.query}", left.exact and right.exact)
+
+
+def _or(
+    left: Optional[Translation],
+    right: Optional[Translation],
+) -> Optional[Translation]:
+    if left is _EVERY or right is _EVERY:
+        return _EVERY
+
+    if left is None or right is None:
+        return None
+
+    # Operands are grouped, so that their conjunctions do not depend on
+    # scryfall operators precedence.
+    return Translation(
+        _any([_group(left.query), _group(right.query)]),
+        left.exact and right.exact,
+    )
+
+
+def _xor(
+    left: Optional[Translation],
+    right: Optional[Translation],
+) -> Optional[Translation]:
+    # Cards matching exactly one side do not match the other one.
+    if left is _EVERY:
+        return _not(right)
+    if right is _EVERY:
+        return _not(left)
+
+    if left is None or right is None:
+        return None
+
+    if left.exact and right.exact:
+        left_only = f"{_group(left.query)} -{_group(right.query)}"
+        right_only = f"-{_group(left.query)} {_group(right.query)}"
+        return Translation(
+            _any([_group(left_only), _group(right_only)]),
+            exact=True,
+        )
+
+    # Cards matching exactly one side match at least one side.
+    return _or(left, right)
+
+
+def _not(leaf: Optional[Translation]) -> Optional[Translation]:
+    if leaf is None or not leaf.exact:
+        # The negation of a superset is not a superset.
+        return None
+
+    if leaf is _EVERY:
+        # No card matches, which scryfall cannot search for.
+        return None
+
+    return Translation(f"-{_group(leaf.query)}", exact=True)
+
+
+def _translate_sets(
+    filter_: CardSetFilter,
+    sets: Collection[str],
+) -> Optional[Translation]:
+    if not filter_.sets:
+        return None
+
+    if sets and set(sets) <= set(filter_.sets):
+        return _EVERY
+
+    return Translation(_any([f"set:{set_}" for set_ in filter_.sets]), exact=True)
+
+
+def _translate_produced_mana(filter_: ProducedManaFilter) -> Optional[Translation]:
+    colors = [color for color in Color.all() if color in filter_.colors]
+
+    queries = []
+
+    if filter_.minimum_count > 0 and colors:
+        queries.append(_any([f"produces:{color.value.lower()}" for color in colors]))
+
+    if filter_.exclusive:
+        queries.extend(
+            f"-produces:{color.value.lower()}"
+            for color in Color.all()
+            if color not in filter_.colors
+        )
+
+    if not queries:
+        return None
+
+    return Translation(" ".join(queries), exact=False)
+
+
+def _translate_basic_land_references(
+    filter_: BasicLandReferencedFilter,
+) -> Optional[Translation]:
+    if filter_.minimum_count <= 0 or not filter_.names:
+        return None
+
+    # Scryfall matches text case insensitively, so excluding other land names
+    # could discard cards the filter accepts: only required names are kept.
+    return Translation(_any([f"fo:{name}" for name in sorted(filter_.names)]), False)
+
+
+def _translate_text(filter_: CardTextFilter) -> Optional[Translation]:
+    literal = longest_literal(filter_.expanded_pattern())
+
+    if literal is None:
+        return None
+
+    # ``fo`` includes reminder text, such as original dual lands abilities.
+    return Translation(f'fo:"{literal}"', exact=False)
+
+
+def longest_literal(  # pylint: disable=too-many-branches, too-many-statements
+    pattern: str,
+) -> Optional[str]:
+    """Return the longest text any string matching ``pattern`` must contain.
+
+    Only literal text outside of groups is considered, and text containing
+    double quotes is ignored, as it cannot be quoted in a scryfall query.
+
+    Example::
+
+    ```python
+    >>> from manabase.filter.pushdown import longest_literal
+    >>> longest_literal(r"^\\{1\\}, \\{T\\}: Add (W|U)\\.$")
+    '{1}, {T}: Add'
+    >>> longest_literal(r"Plains|Island") is None
+    True
+
+    ```
+    """
+    literals: List[str] = []
+    current = ""
+    depth = 0
+    index = 0
+
+    def flush():
+        nonlocal current
+        literals.extend(current.split('"'))
+        current = ""
+
+    while index < len(pattern):
+        char = pattern[index]
+        index += 1
+
+        if char == "\\" and index < len(pattern):
+            escaped = pattern[index]
+            index += 1
+            if depth or escaped.isalnum():
+                # Character classes such as ``\w``, or anchors such as ``\b``.
+                flush()
+                continue
+            current += escaped
+
+        elif char == "(":
+            depth += 1
+            flush()
+            continue
+
+        elif char == ")":
+            depth -= 1
+            continue
+
+        elif char == "|":
+            if depth == 0:
+                # Top level alternatives do not share required text.
+                return None
+            continue
+
+        elif char == "[":
+            flush()
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+            continue
+
+        elif char == "{":
+            # A ``{m,n}`` quantifier, the previous character may be optional.
+            current = current[:-1]
+            flush()
+            while index < len(pattern) and pattern[index] != "}":
+                index += 1
+            index += 1
+            continue
+
+        elif depth or char in ".^$?*+":
+            flush()
+            continue
+
+        else:
+            current += char
+
+        # A quantifier applies to the previous character only.
+        if index < len(pattern) and pattern[index] in _QUANTIFIERS:
+            if pattern[index] in _OPTIONAL_QUANTIFIERS:
+                current = current[:-1]
+            flush()
+
+    flush()
+
+    # Mana symbols cut in half are not valid scryfall text.
+    candidates = [
+        literal.strip().lstrip("}").rstrip("{").strip() for literal in literals
+    ]
+    candidates = [
+        literal for literal in candidates if len(literal) >= MINIMUM_LITERAL_LENGTH
+    ]
+
+    if not candidates:
+        return None
+
+    return max(candidates, key=len)
+
+
+def _any(queries: List[str]) -> str:
+    """Return a query matching any of ``queries``."""
+    if len(queries) == 1:
+        return queries[0]
+    return _group(" or ".join(queries))
+
+
+def _group(query: str) -> str:
+    """Wrap ``query`` in parenthesis, unless it is a single term or group."""
+    if _is_term(query) or _is_group(query):
+        return query
+    return f"({query})"
+
+
+def _is_term(query: str) -> bool:
+    """Return ``True`` if ``query`` has no space outside of quotes."""
+    quoted = False
+
+    for char in query:
+        if char == '"':
+            quoted = not quoted
+        elif char == " " and not quoted:
+            return False
+
+    return True
+
+
+def _is_group(query: str) -> bool:
+    """Return ``True`` if ``query`` is entirely wrapped in parenthesis."""
+    if not query.startswith("("):
+        return False
+
+    depth = 0
+    quoted = False
+
+    for index, char in enumerate(query):
+        if char == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index == len(query) - 1
+
+    return False
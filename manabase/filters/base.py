@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from pydantic.main import BaseModel
 
-from ..cards import Card
+from ..cards import AnyCard, Card  # pylint: disable=unused-import
+from ..table import CardTable, bitset
 
 
 class CardFilter(BaseModel, metaclass=ABCMeta):
@@ -60,7 +61,7 @@ class CardFilter(BaseModel, metaclass=ABCMeta):
     """
 
     @abstractmethod
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         """Filter a single card.
 
         Example::
@@ -94,12 +95,114 @@ class CardFilter(BaseModel, metaclass=ABCMeta):
         ```
         """
 
+    def filter_batch(self, table: CardTable) -> int:
+        """Filter every card of ``table`` at once.
 
-class FilterResult(BaseModel):
+        Return the bitset of accepted rows, see `CardTable`.
+        """
+        return self.accept_batch(table).mask
+
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        """Filter every card of ``table`` at once, tracking accepting filters.
+
+        Filters override this method to evaluate a whole table with
+        `CardTable` predicates. By default, cards are filtered one at a time.
+
+        Example::
+
+        ```python
+        >>> from manabase.cards import Card
+        >>> from manabase.filters.base import CardFilter, FilterResult
+        >>> from manabase.table import CardTable
+        >>> class NamedFilter(CardFilter):
+        ...     def filter_card(self, card: Card) -> FilterResult:
+        ...         if card.name:
+        ...             return FilterResult(card=card, accepted_by=self)
+        ...         return FilterResult(card=card)
+        >>> table = CardTable([Card.named(""), Card.named("Tundra")])
+        >>> bin(NamedFilter().filter_batch(table))
+        '0b10'
+
+        ```
+        """
+        accepted: Dict[int, Tuple[CardFilter, List[int]]] = {}
+
+        for index, card in enumerate(table.cards):
+            filter_ = self.filter_card(card).accepted_by
+            if filter_ is not None:
+                accepted.setdefault(id(filter_), (filter_, []))[1].append(index)
+
+        return BatchResult(
+            [(filter_, bitset(indexes)) for filter_, indexes in accepted.values()]
+        )
+
+
+class FilterResult:
     """Result of a filter operation.
 
     `FilterResult.accepted_by` is filled with the filter that accepted the card.
+
+    Filters return a result for each card they see, so results are plain
+    objects, without validation.
+    """
+
+    __slots__ = ("card", "accepted_by")
+
+    def __init__(self, card: AnyCard, accepted_by: Optional[CardFilter] = None):
+        self.card = card
+        self.accepted_by = accepted_by
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FilterResult):
+            return NotImplemented
+        return (self.card, self.accepted_by) == (other.card, other.accepted_by)
+
+    def __repr__(self) -> str:
+        return f"FilterResult(card={self.card!r}, accepted_by={self.accepted_by!r})"
+
+
+class BatchResult:
+    """Result of a filter operation over a `CardTable`.
+
+    `BatchResult.accepted` pairs each accepting filter with the bitset of rows
+    it accepted. Bitsets never overlap.
     """
 
-    card: Card
-    accepted_by: Optional[CardFilter] = None
+    __slots__ = ("accepted",)
+
+    def __init__(self, accepted: Optional[List[Tuple[CardFilter, int]]] = None):
+        self.accepted = [(filter_, mask) for filter_, mask in accepted or [] if mask]
+
+    @classmethod
+    def of(cls, filter_: CardFilter, mask: int) -> BatchResult:
+        """Return a result where ``filter_`` accepted the rows of ``mask``."""
+        return cls([(filter_, mask)])
+
+    @property
+    def mask(self) -> int:
+        """Bitset of every accepted row."""
+        mask = 0
+        for _, accepted in self.accepted:
+            mask |= accepted
+        return mask
+
+    def restrict(self, mask: int) -> BatchResult:
+        """Return this result, keeping only the rows of ``mask``."""
+        return BatchResult([(filter_, rows & mask) for filter_, rows in self.accepted])
+
+    def __or__(self, other: BatchResult) -> BatchResult:
+        """Merge results accepting distinct rows."""
+        return BatchResult(self.accepted + other.accepted)
+
+    def results(self, table: CardTable) -> List[FilterResult]:
+        """Return the results of accepted cards, in the order of ``table``."""
+        accepted_by: Dict[int, CardFilter] = {}
+
+        for filter_, mask in self.accepted:
+            for index in table.indexes(mask):
+                accepted_by[index] = filter_
+
+        return [
+            FilterResult(card=table.cards[index], accepted_by=accepted_by[index])
+            for index in sorted(accepted_by)
+        ]
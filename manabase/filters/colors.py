@@ -2,10 +2,13 @@
 import re
 from typing import List, Set, Union
 
-from ..cards import Card
+from ..cards import AnyCard, Card  # pylint: disable=unused-import
 from ..colors import Color
 from ..filters.composite import CompositeFilter
-from .base import FilterResult
+from ..table import MANA_BITS, CardTable, mana_mask
+from .base import BatchResult, FilterResult
+
+_BASIC_LAND_NAMES = re.compile("(Plains|Island|Swamp|Mountain|Forest)")
 
 
 class ProducedManaFilter(CompositeFilter):
@@ -59,7 +62,7 @@ class ProducedManaFilter(CompositeFilter):
     exclusive: bool = True
     minimum_count: int = 2
 
-    def filter_card(self, card: Card) -> Union[FilterResult, bool]:
+    def filter_card(self, card: AnyCard) -> Union[FilterResult, bool]:
         produced_mana = [Color(mana) for mana in card.produced_mana if mana != "C"]
         if self.exclusive and not set(produced_mana).issubset(self.colors):
             return FilterResult(card=card)
@@ -67,6 +70,17 @@ class ProducedManaFilter(CompositeFilter):
             return FilterResult(card=card)
         return FilterResult(card=card, accepted_by=self)
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        colors = mana_mask(color.value for color in self.colors)
+
+        def accepts(value: int) -> bool:
+            value &= ~MANA_BITS["C"]
+            if self.exclusive and value & ~colors:
+                return False
+            return bin(value & colors).count("1") >= self.minimum_count
+
+        return BatchResult.of(self, table.where("produced_mana", accepts))
+
 
 class BasicLandReferencedFilter(CompositeFilter):
     """A filter checking if the card text referenced some basic land names.
@@ -126,7 +140,7 @@ class BasicLandReferencedFilter(CompositeFilter):
             kwargs["names"] = set(color.to_basic_land_name() for color in colors)
         super().__init__(**kwargs)
 
-    def filter_card(self, card: Card) -> Union[FilterResult, bool]:
+    def filter_card(self, card: AnyCard) -> Union[FilterResult, bool]:
         names = set(self._extract_basic_land_names(card))
         if self.exclusive and not names.issubset(self.names):
             return FilterResult(card=card)
@@ -134,8 +148,17 @@ class BasicLandReferencedFilter(CompositeFilter):
             return FilterResult(card=card)
         return FilterResult(card=card, accepted_by=self)
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        def accepts(text: str) -> bool:
+            names = set(self._extract_names(text))
+            if self.exclusive and not names.issubset(self.names):
+                return False
+            return len(self.names.intersection(names)) >= self.minimum_count
+
+        return BatchResult.of(self, table.where_oracle(accepts))
+
     @staticmethod
-    def _extract_basic_land_names(card: Card) -> List[str]:
+    def _extract_basic_land_names(card: AnyCard) -> List[str]:
         """Extract basic land names from a card text.
 
         Example::
@@ -161,6 +184,9 @@ class BasicLandReferencedFilter(CompositeFilter):
 
         ```
         """
-        regex = re.compile("(Plains|Island|Swamp|Mountain|Forest)")
-        names = filter(None, regex.findall(card.oracle_text))
+        return BasicLandReferencedFilter._extract_names(card.oracle_text)
+
+    @staticmethod
+    def _extract_names(text: str) -> List[str]:
+        names = filter(None, _BASIC_LAND_NAMES.findall(text))
         return list(names)
@@ -43,8 +43,9 @@ from __future__ import annotations
 
 from abc import ABCMeta
 
-from ..cards import Card
-from .base import CardFilter, FilterResult
+from ..cards import AnyCard
+from ..table import CardTable
+from .base import BatchResult, CardFilter, FilterResult
 
 
 class CompositeFilter(CardFilter, metaclass=ABCMeta):
@@ -72,12 +73,18 @@ class AndOperator(CompositeFilter):
     left: CompositeFilter
     right: CompositeFilter
 
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         left = self.left.filter_card(card)
         if left.accepted_by is None:
             return FilterResult(card=card)
         return self.right.filter_card(card)
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        left = self.left.filter_batch(table)
+        if not left:
+            return BatchResult()
+        return self.right.accept_batch(table).restrict(left)
+
 
 class OrOperator(CompositeFilter):
     """An ``or`` operator.
@@ -88,13 +95,18 @@ class OrOperator(CompositeFilter):
     left: CompositeFilter
     right: CompositeFilter
 
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         left = self.left.filter_card(card)
         if left.accepted_by is not None:
             return left
         right = self.right.filter_card(card)
         return right
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        left = self.left.accept_batch(table)
+        right = self.right.accept_batch(table)
+        return left | right.restrict(table.all & ~left.mask)
+
 
 class XorOperator(CompositeFilter):
     """An ``xor`` operator.
@@ -105,7 +117,7 @@ class XorOperator(CompositeFilter):
     left: CompositeFilter
     right: CompositeFilter
 
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         left = self.left.filter_card(card)
         right = self.right.filter_card(card)
         if left.accepted_by is not None and right.accepted_by is not None:
@@ -116,6 +128,11 @@ class XorOperator(CompositeFilter):
             return FilterResult(card=card, accepted_by=self.left)
         return FilterResult(card=card, accepted_by=self.right)
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        left = self.left.filter_batch(table)
+        right = self.right.filter_batch(table)
+        return BatchResult([(self.left, left & ~right), (self.right, right & ~left)])
+
 
 class InvertOperator(CompositeFilter):
     """A ``not`` operator.
@@ -125,8 +142,11 @@ class InvertOperator(CompositeFilter):
 
     leaf: CompositeFilter
 
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         res = self.leaf.filter_card(card)
         if res.accepted_by is not None:
             return FilterResult(card=card)
         return FilterResult(card=card, accepted_by=self.leaf)
+
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        return BatchResult.of(self.leaf, table.all & ~self.leaf.filter_batch(table))
@@ -1,8 +1,9 @@
 """Filter based on the card set."""
 from typing import List
 
-from ..cards import Card
-from .base import FilterResult
+from ..cards import AnyCard
+from ..table import CardTable
+from .base import BatchResult, FilterResult
 from .composite import CompositeFilter
 
 
@@ -11,7 +12,10 @@ class CardSetFilter(CompositeFilter):
 
     sets: List[str]
 
-    def filter_card(self, card: Card) -> FilterResult:
+    def filter_card(self, card: AnyCard) -> FilterResult:
         if card.set in self.sets:
             return FilterResult(card=card, accepted_by=self)
         return FilterResult(card=card)
+
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        return BatchResult.of(self, table.where_sets(self.sets))
@@ -1,11 +1,17 @@
 """Filter based on the card text.
 
 It matches the card oracle text with a regex pattern.
+
+Patterns are expanded and compiled once, by `compile_pattern`, and shared by
+every filter using them.
 """
 import re
+from functools import lru_cache
+from typing import Pattern
 
-from ..cards import Card
-from .base import FilterResult
+from ..cards import AnyCard
+from ..table import CardTable
+from .base import BatchResult, FilterResult
 from .composite import CompositeFilter
 
 
@@ -14,13 +20,23 @@ class CardTextFilter(CompositeFilter):
 
     pattern: str
 
-    def filter_card(self, card: Card) -> FilterResult:
-        regex = re.compile(self._process_pattern(self.pattern))
-        res = bool(regex.match(card.oracle_text))
+    def filter_card(self, card: AnyCard) -> FilterResult:
+        res = bool(self.regex().match(card.oracle_text))
         if not res:
             return FilterResult(card=card)
         return FilterResult(card=card, accepted_by=self)
 
+    def accept_batch(self, table: CardTable) -> BatchResult:
+        return BatchResult.of(self, table.where_text(self.regex()))
+
+    def regex(self) -> Pattern[str]:
+        """Return the compiled pattern, see `compile_pattern`."""
+        return compile_pattern(self.pattern)
+
+    def expanded_pattern(self) -> str:
+        """Return the pattern, with its formatting keys expanded."""
+        return self._process_pattern(self.pattern)
+
     @staticmethod
     def _process_pattern(pattern: str) -> str:
         """Format the pattern with helpers.
@@ -37,3 +53,25 @@ class CardTextFilter(CompositeFilter):
             "c": r"\{C\}",
         }
         return pattern % context
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> Pattern[str]:
+    """Expand and compile a `CardTextFilter` pattern.
+
+    Compiled patterns are cached, so each distinct pattern is only expanded
+    and compiled once.
+
+    Example::
+
+    ```python
+    >>> from manabase.filters.text import compile_pattern
+    >>> compile_pattern("%(tap)s").pattern
+    '\\\\{T\\\\}'
+    >>> compile_pattern("%(tap)s") is compile_pattern("%(tap)s")
+    True
+
+    ```
+    """
+    # pylint: disable=protected-access
+    return re.compile(CardTextFilter._process_pattern(pattern))
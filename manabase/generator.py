@@ -1,28 +1,55 @@
 """Card list generator."""
-from typing import Optional
+from typing import Iterable, Optional
 
 from pydantic import BaseModel
 
-from .cards import CardList
-from .client import Client
+from .cards import AnyCard, CardList
+from .client import AsyncClient
 from .filler.filler import ListFiller
 from .filter.manager import FilterManager
+from .filter.pushdown import translate_filter
 from .priorities import PriorityManager
 from .query import SetQueryBuilder
+from .source import CardSource
 
 
 class ListGenerator(BaseModel):
-    """Generates a list of cards from a query, filters, priorities and filler cards."""
+    """Generates a list of cards from a query, filters, priorities and filler cards.
+
+    With ``pushdown`` enabled, filters are translated into the scryfall query,
+    so that fewer cards are downloaded.
+    """
 
     filters: FilterManager
     priorities: PriorityManager
     query: SetQueryBuilder
     filler: Optional[ListFiller] = None
+    pushdown: bool = False
+
+    def generate(self, client: CardSource) -> CardList:
+        """Generate the list of cards.
+
+        ``client`` can be any card source, such as a `Client` or a
+        `BulkDataSource`.
+        """
+        cards = client.iter_cards(self._build_query())
+
+        return self._build_list(cards)
+
+    async def generate_async(self, client: AsyncClient) -> CardList:
+        """Generate the list of cards, fetching them asynchronously."""
+        cards = await client.fetch(self._build_query())
+
+        return self._build_list(cards)
+
+    def _build_query(self) -> SetQueryBuilder:
+        if not self.pushdown:
+            return self.query
 
-    def generate(self, client: Client) -> CardList:
-        """Generate the list of cards."""
-        cards = client.fetch(self.query)
+        pushdown = translate_filter(self.filters.filters, self.query.sets)
+        return self.query.copy(update={"pushdown": pushdown})
 
+    def _build_list(self, cards: Iterable[AnyCard]) -> CardList:
         results = self.filters.filter_cards(cards)
 
         card_list = self.priorities.build_list(results)
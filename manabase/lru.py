@@ -0,0 +1,66 @@
+"""A size bounded, in-memory, least recently used cache."""
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class LRUCache(Generic[ValueType]):
+    """A thread safe mapping keeping at most ``maxsize`` items.
+
+    When full, the least recently used item is discarded.
+
+    Example::
+
+    ```python
+    >>> from manabase.lru import LRUCache
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.put("a", 1)
+    >>> cache.put("b", 2)
+    >>> cache.get("a")
+    1
+    >>> cache.put("c", 3)
+    >>> cache.get("b") is None
+    True
+
+    ```
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        """Return the item stored at ``key``, or ``None``."""
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return None
+            return self._items[key]
+
+    def put(self, key: Hashable, value: ValueType):
+        """Store ``value`` at ``key``, discarding the least recently used item."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """Remove the item stored at ``key``, if any."""
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        """Remove every item."""
+        with self._lock:
+            self._items.clear()
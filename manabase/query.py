@@ -1,6 +1,8 @@
 """Scryfall queries."""
+from __future__ import annotations
+
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -23,14 +25,22 @@ class QueryBuilder(BaseModel):
 
 
 class SetQueryBuilder(QueryBuilder):
-    """A set dependant query builder."""
+    """A set dependant query builder.
+
+    ``pushdown`` is an optional scryfall query narrowing the search down,
+    usually translated from filters with `translate_filter`.
+    """
 
     sets: List[str]
+    pushdown: Optional[str] = None
 
     def build(self) -> str:
         """Build the query string."""
         query = super().build()
 
+        if self.pushdown:
+            query = f"{query} {self.pushdown}"
+
         if not self.sets:
             return query
 
@@ -42,6 +52,30 @@ class SetQueryBuilder(QueryBuilder):
 
         return f"{query} {sets}"
 
+    def split(self, size: int) -> List[SetQueryBuilder]:
+        """Split this query into sub-queries of at most ``size`` sets each.
+
+        Example::
+
+        ```python
+        >>> from manabase.query import SetQueryBuilder
+        >>> builder = SetQueryBuilder(type="land", sets=["ala", "c13", "c20"])
+        >>> [shard.build() for shard in builder.split(2)]
+        ['t:land (set:ala or set:c13)', 't:land (set:c20)']
+
+        ```
+
+        Raises:
+            ValueError: If ``size`` is lower than one.
+        """
+        if size < 1:
+            raise ValueError("Shards should contain at least one set.")
+
+        return [
+            self.copy(update={"sets": self.sets[index : index + size]})
+            for index in range(0, len(self.sets), size)
+        ]
+
     @staticmethod
     def _or(queries: List[str]) -> str:
         """Return an OR grouped list of queries."""
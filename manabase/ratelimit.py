@@ -0,0 +1,195 @@
+"""Throttle requests sent to scryfall.
+
+Scryfall asks its clients to keep their request rate around 10 requests per
+second, and answers with a ``429`` status when they do not.
+
+`RateLimiter` combines two mechanisms:
+
+- A token bucket enforcing the request rate.
+  It is shared by every thread using the limiter, and optionally by every
+  process using the same state directory.
+- An adaptive concurrency limit, growing additively while requests succeed,
+  and cut multiplicatively when requests are throttled or latency rises.
+
+Example::
+
+```python
+>>> from manabase.ratelimit import RateLimiter
+>>> limiter = RateLimiter(rate=100.0, concurrency=1.0)
+>>> with limiter.request() as permit:
+...     permit.throttled = False
+>>> limiter.concurrency
+2.0
+
+```
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from diskcache import Cache
+
+
+class Permit:  # pylint: disable=too-few-public-methods
+    """Permission to send a single request.
+
+    Set `Permit.throttled` if the server asked us to slow down.
+    """
+
+    def __init__(self):
+        self.throttled = False
+
+
+class RateLimiter:  # pylint: disable=too-many-instance-attributes
+    """A token bucket rate limiter with an adaptive concurrency limit.
+
+    Args:
+        rate: Number of requests allowed per second.
+        burst: Maximum number of requests sent at once after an idle period.
+        concurrency: Initial number of concurrent requests.
+        max_concurrency: Upper bound of the concurrency limit.
+        latency_factor: A request slower than ``latency_factor`` times the
+            average latency is considered a congestion signal.
+        path: If set, the token bucket state is stored in this directory,
+            and shared by all processes using it.
+    """
+
+    DECREASE_FACTOR = 0.5
+    LATENCY_SMOOTHING = 0.2
+    LATENCY_FLOOR = 0.05
+
+    _BUCKET_KEY = "bucket"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rate: float = 10.0,
+        burst: float = 2.0,
+        concurrency: float = 2.0,
+        max_concurrency: float = 8.0,
+        latency_factor: float = 2.0,
+        path: Optional[Path] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_factor = latency_factor
+        self.path = path
+
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._latency: Optional[float] = None
+
+        self._tokens = burst
+        self._updated_at = time.time()
+        self._bucket_lock = threading.Lock()
+        self._shared: Optional[Cache] = Cache(str(path)) if path else None
+
+    @contextmanager
+    def request(self) -> Iterator[Permit]:
+        """Wait for the permission to send a request.
+
+        The request latency and outcome are fed back to the concurrency limit.
+        Exceptions raised while the permit is held count as congestion.
+        """
+        self._enter()
+        permit = Permit()
+        start = time.monotonic()
+
+        try:
+            self._take_token()
+            start = time.monotonic()
+            yield permit
+        except BaseException:
+            permit.throttled = True
+            raise
+        finally:
+            self._leave(time.monotonic() - start, permit.throttled)
+
+    def _enter(self):
+        """Wait for a free concurrency slot."""
+        with self._condition:
+            while self._in_flight >= max(1, int(self.concurrency)):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def _leave(self, latency: float, throttled: bool):
+        """Release a concurrency slot and adapt the concurrency limit."""
+        with self._condition:
+            self._in_flight -= 1
+
+            # Jitter on very fast requests is not a congestion signal.
+            congested = throttled or (
+                self._latency is not None
+                and latency > self.LATENCY_FLOOR
+                and latency > self.latency_factor * self._latency
+            )
+
+            if congested:
+                self.concurrency = max(1.0, self.concurrency * self.DECREASE_FACTOR)
+            else:
+                self.concurrency = min(
+                    self.max_concurrency,
+                    self.concurrency + 1.0 / self.concurrency,
+                )
+
+            if not throttled:
+                if self._latency is None:
+                    self._latency = latency
+                else:
+                    self._latency += self.LATENCY_SMOOTHING * (latency - self._latency)
+
+            self._condition.notify_all()
+
+    def _take_token(self):
+        """Wait until a token is available, and consume it."""
+        while True:
+            if self._shared is not None:
+                delay = self._consume_shared()
+            else:
+                with self._bucket_lock:
+                    delay = self._consume_local()
+
+            if delay <= 0:
+                return
+
+            time.sleep(delay)
+
+    def _consume_local(self) -> float:
+        """Consume a token, or return the time to wait for the next one."""
+        self._tokens, self._updated_at, delay = self._consume(
+            self._tokens,
+            self._updated_at,
+        )
+        return delay
+
+    def _consume_shared(self) -> float:
+        """Consume a token from the bucket shared between processes."""
+        assert self._shared is not None
+
+        with self._shared.transact():
+            tokens, updated_at = self._shared.get(
+                self._BUCKET_KEY,
+                (self.burst, time.time()),
+            )
+            tokens, updated_at, delay = self._consume(tokens, updated_at)
+            self._shared.set(self._BUCKET_KEY, (tokens, updated_at))
+
+        return delay
+
+    def _consume(self, tokens: float, updated_at: float):
+        """Refill a bucket, then try to take a token from it.
+
+        Return the new bucket state, and the time to wait if it was empty.
+        """
+        now = time.time()
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+        if tokens >= 1:
+            return tokens - 1, now, 0.0
+
+        return tokens, now, (1 - tokens) / self.rate
@@ -0,0 +1,264 @@
+"""A compact binary format for cached cards.
+
+Pickled `Card` models are large, and slow to load: each model carries its own
+copy of every string, including the ``legalities`` dict keys and values.
+
+Cards are instead stored column by column, each column referencing strings of
+a shared string table, or distinct lists and mappings, then compressed with
+zlib.
+A header holds a magic number and the format version, so that data written by
+another version of this format is detected instead of misread.
+
+`SCHEMA_VERSION` identifies the format and the `Card` fields it stores: it
+only changes when cards written before can no longer be read the same way.
+
+Example::
+
+```python
+>>> from manabase.cards import Card
+>>> from manabase.serialization import dump_cards, load_cards
+>>> cards = [Card.named("Tundra"), Card.named("Underground Sea")]
+>>> load_cards(dump_cards(cards)) == cards
+True
+
+```
+"""
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+from .cards import Card
+
+MAGIC = b"MNBC"
+FORMAT_VERSION = 2
+
+STRING_FIELDS: Tuple[str, ...] = (
+    "name",
+    "oracle_text",
+    "scryfall_uri",
+    "set",
+    "id",
+    "oracle_id",
+)
+LIST_FIELDS: Tuple[str, ...] = ("colors", "color_identity", "produced_mana")
+MAPPING_FIELDS: Tuple[str, ...] = ("legalities",)
+FLAG_FIELDS: Tuple[str, ...] = ("textless",)
+
+
+def _schema_version() -> str:
+    """Hash the format version with the fields and types of `Card`."""
+    schema = {
+        "magic": MAGIC.decode("ascii"),
+        "format": FORMAT_VERSION,
+        "groups": [STRING_FIELDS, LIST_FIELDS, MAPPING_FIELDS, FLAG_FIELDS],
+        "fields": [
+            [name, str(field.outer_type_), field.required]
+            for name, field in Card.__fields__.items()
+        ],
+    }
+    digest = hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+SCHEMA_VERSION = _schema_version()
+
+_HEADER = struct.Struct("<4sHI")
+_SIZE = struct.Struct("<I")
+_INDEX_TYPE = "I"
+_LENGTH_TYPE = "H"
+
+
+class UnsupportedFormat(ValueError):
+    """Raised when data was not written by this version of the format."""
+
+
+class ValueTable:
+    """Assigns an index to each distinct value."""
+
+    def __init__(self):
+        self.values: List[Hashable] = []
+        self.indexes: Dict[Hashable, int] = {}
+
+    def index(self, value: Hashable) -> int:
+        """Return the index of ``value``, adding it to the table if needed."""
+        try:
+            return self.indexes[value]
+        except KeyError:
+            self.indexes[value] = len(self.values)
+            self.values.append(value)
+            return self.indexes[value]
+
+
+def dump_cards(cards: List[Card], level: int = 6) -> bytes:
+    """Serialize ``cards``, compressed at zlib ``level``."""
+    strings = ValueTable()
+    columns: List[array] = []
+
+    for field in STRING_FIELDS:
+        columns.append(
+            array(_INDEX_TYPE, [strings.index(getattr(card, field)) for card in cards])
+        )
+
+    # Few distinct lists and mappings exist, such as color combinations, so
+    # each is stored once and cards reference them.
+    for field in LIST_FIELDS:
+        lists = ValueTable()
+        column = array(
+            _INDEX_TYPE, [lists.index(tuple(getattr(card, field))) for card in cards]
+        )
+        lengths = array(_LENGTH_TYPE, [len(items) for items in lists.values])
+        items = array(
+            _INDEX_TYPE,
+            [strings.index(item) for items in lists.values for item in items],
+        )
+        columns.extend([column, lengths, items])
+
+    for field in MAPPING_FIELDS:
+        mappings = ValueTable()
+        column = array(
+            _INDEX_TYPE,
+            [mappings.index(tuple(getattr(card, field).items())) for card in cards],
+        )
+        lengths = array(_LENGTH_TYPE, [len(pairs) for pairs in mappings.values])
+        keys = array(
+            _INDEX_TYPE,
+            [strings.index(key) for pairs in mappings.values for key, _ in pairs],
+        )
+        values = array(
+            _INDEX_TYPE,
+            [strings.index(value) for pairs in mappings.values for _, value in pairs],
+        )
+        columns.extend([column, lengths, keys, values])
+
+    for field in FLAG_FIELDS:
+        columns.append(array("B", [bool(getattr(card, field)) for card in cards]))
+
+    encoded = [string.encode("utf-8") for string in strings.values]
+    sections = [
+        array(_INDEX_TYPE, [len(string) for string in encoded]).tobytes(),
+        b"".join(encoded),
+    ]
+    sections.extend(_to_little_endian(column).tobytes() for column in columns)
+
+    body = b"".join(_SIZE.pack(len(section)) + section for section in sections)
+
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, len(cards)) + zlib.compress(body, level)
+
+
+def load_cards(data: bytes) -> List[Card]:
+    """Deserialize cards written by `dump_cards`.
+
+    Cards are trusted, and constructed without validation.
+
+    Raises:
+        UnsupportedFormat: If ``data`` was not written by this format version.
+    """
+    if len(data) < _HEADER.size:
+        raise UnsupportedFormat("Truncated card data.")
+
+    magic, version, count = _HEADER.unpack_from(data)
+
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise UnsupportedFormat(f"Unsupported card data format {magic!r} v{version}.")
+
+    try:
+        cards = _load_columns(zlib.decompress(data[_HEADER.size :]))
+    except (zlib.error, StopIteration, IndexError, ValueError) as error:
+        raise UnsupportedFormat("Corrupted card data.") from error
+
+    if len(cards) != count:
+        raise UnsupportedFormat("Corrupted card data.")
+
+    return cards
+
+
+def _load_columns(body: bytes) -> List[Card]:  # pylint: disable=too-many-locals
+    sections = _iter_sections(body)
+
+    lengths = _read_array(_INDEX_TYPE, next(sections))
+    blob = next(sections)
+    strings: List[str] = []
+    offset = 0
+    for length in lengths:
+        strings.append(blob[offset : offset + length].decode("utf-8"))
+        offset += length
+
+    def read_indexes() -> array:
+        return _read_array(_INDEX_TYPE, next(sections))
+
+    def read_strings() -> List[str]:
+        return [strings[index] for index in read_indexes()]
+
+    fields: Dict[str, List] = {}
+
+    for field in STRING_FIELDS:
+        fields[field] = read_strings()
+
+    # Distinct lists and mappings are copied, so cards never share them.
+    for field in LIST_FIELDS:
+        column = read_indexes()
+        sizes = _read_array(_LENGTH_TYPE, next(sections))
+        lists = list(_split(read_strings(), sizes))
+        fields[field] = [lists[index].copy() for index in column]
+
+    for field in MAPPING_FIELDS:
+        column = read_indexes()
+        sizes = _read_array(_LENGTH_TYPE, next(sections))
+        keys = _split(read_strings(), sizes)
+        values = _split(read_strings(), sizes)
+        mappings = [dict(zip(*pair)) for pair in zip(keys, values)]
+        fields[field] = [mappings[index].copy() for index in column]
+
+    for field in FLAG_FIELDS:
+        fields[field] = [bool(flag) for flag in next(sections)]
+
+    # Fields are kept in declaration order, so that loaded cards iterate and
+    # serialize their fields like validated ones.
+    names = tuple(Card.__fields__)
+    columns = [fields[name] for name in names]
+
+    return [_restore(dict(zip(names, values))) for values in zip(*columns)]
+
+
+def _restore(values: Dict) -> Card:
+    """Build a card the way `pickle` does, skipping `Card.construct` defaults."""
+    card = object.__new__(Card)
+    card.__setstate__({"__dict__": values, "__fields_set__": set(values)})
+    return card
+
+
+def _iter_sections(body: bytes) -> Iterator[bytes]:
+    """Iterate over the length prefixed sections of ``body``."""
+    offset = 0
+
+    while offset < len(body):
+        (size,) = _SIZE.unpack_from(body, offset)
+        offset += _SIZE.size
+        yield body[offset : offset + size]
+        offset += size
+
+
+def _read_array(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    return _to_little_endian(column)
+
+
+def _to_little_endian(column: array) -> array:
+    """Swap bytes of ``column`` on big endian platforms, in place."""
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _split(values: List, sizes: array) -> Iterator[List]:
+    """Split ``values`` into consecutive lists of ``sizes`` items."""
+    offset = 0
+
+    for size in sizes:
+        yield values[offset : offset + size]
+        offset += size
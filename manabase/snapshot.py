@@ -0,0 +1,409 @@
+"""Read-only card snapshots, shared by processes through ``mmap``.
+
+Each process reading the cache loads its own copy of the cards.
+A snapshot instead exports the whole cache into a single immutable file,
+memory mapped by readers: its pages are shared by every process reading it,
+and cards are only decoded when accessed, through lazy `CardView` objects.
+
+A snapshot file holds a header, a table of sections, then the sections:
+
+- A string table, as offsets into a blob of UTF-8 strings.
+- Tables of distinct lists and mappings, referencing strings.
+- Fixed-width partition records: query type, set code, and range of cards.
+- Fixed-width card records, referencing strings, lists and mappings.
+
+Example::
+
+```python
+>>> from pathlib import Path
+>>> from tempfile import TemporaryDirectory
+>>> from manabase.cache import CacheManager
+>>> from manabase.cards import Card
+>>> from manabase.query import QueryType
+>>> from manabase.snapshot import CardSnapshot, write_snapshot
+>>> card = Card.named("Tundra").copy(update={"set": "vma"})
+>>> with TemporaryDirectory() as directory:
+...     cache = CacheManager(Path(directory) / "cache")
+...     cache.write_cache(QueryType.land, ["vma"], [card])
+...     write_snapshot(cache, Path(directory) / "cards.snapshot")
+...     with CardSnapshot(Path(directory) / "cards.snapshot") as snapshot:
+...         [view.name for view in snapshot.cards(QueryType.land, "vma")]
+['Tundra']
+
+```
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .cache import CacheManager
+from .cards import AnyCard, Card, CardRecord
+from .files import replace_file
+from .query import QueryType, SetQueryBuilder
+from .serialization import (
+    FLAG_FIELDS,
+    LIST_FIELDS,
+    MAPPING_FIELDS,
+    STRING_FIELDS,
+    ValueTable,
+)
+from .source import CardSource
+
+MAGIC = b"MNBS"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<QQ")
+_INDEX = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_PARTITION = struct.Struct("<IIII")
+_CARD = struct.Struct(
+    "<"
+    + "I" * (len(STRING_FIELDS) + len(LIST_FIELDS) + len(MAPPING_FIELDS))
+    + "B" * len(FLAG_FIELDS)
+)
+
+_STRING_OFFSETS = 0
+_STRINGS = 1
+_LIST_OFFSETS = 2
+_LIST_ITEMS = 3
+_MAPPING_OFFSETS = 4
+_MAPPING_ITEMS = 5
+_PARTITIONS = 6
+_CARDS = 7
+_SECTIONS = 8
+
+_ALIGNMENT = 8
+
+_STRING = "string"
+_LIST = "list"
+_MAPPING = "mapping"
+_FLAG = "flag"
+
+# Position of each field in card records, and how to decode it.
+_FIELDS: Dict[str, Tuple[int, str]] = {
+    field: (position, kind)
+    for position, (field, kind) in enumerate(
+        [(field, _STRING) for field in STRING_FIELDS]
+        + [(field, _LIST) for field in LIST_FIELDS]
+        + [(field, _MAPPING) for field in MAPPING_FIELDS]
+        + [(field, _FLAG) for field in FLAG_FIELDS]
+    )
+}
+
+
+class UnsupportedSnapshot(ValueError):
+    """Raised when a file is not a snapshot of this format version."""
+
+
+def write_snapshot(  # pylint: disable=too-many-locals
+    cache: CacheManager,
+    path: Path,
+):
+    """Export every partition of ``cache`` into a snapshot file at ``path``.
+
+    The file is written next to ``path`` then moved over it, so readers of a
+    previous snapshot keep reading consistent data.
+    """
+    strings = ValueTable()
+    lists = ValueTable()
+    mappings = ValueTable()
+    partitions = bytearray()
+    cards = bytearray()
+    count = 0
+
+    for query, set_code, _ in sorted(
+        cache.iter_partitions(),
+        key=lambda partition: (partition[0].value, partition[1]),
+    ):
+        partition = cache.read_cache(query, [set_code])
+        partitions += _PARTITION.pack(
+            strings.index(query.value),
+            strings.index(set_code),
+            count,
+            len(partition),
+        )
+        for card in partition:
+            cards += _CARD.pack(
+                *[strings.index(getattr(card, field)) for field in STRING_FIELDS],
+                *[lists.index(tuple(getattr(card, field))) for field in LIST_FIELDS],
+                *[
+                    mappings.index(tuple(getattr(card, field).items()))
+                    for field in MAPPING_FIELDS
+                ],
+                *[bool(getattr(card, field)) for field in FLAG_FIELDS],
+            )
+        count += len(partition)
+
+    list_offsets, list_items = _pack_tables(
+        lists.values,
+        lambda items: b"".join(_INDEX.pack(strings.index(item)) for item in items),
+    )
+    mapping_offsets, mapping_items = _pack_tables(
+        mappings.values,
+        lambda pairs: b"".join(
+            _PAIR.pack(strings.index(key), strings.index(value)) for key, value in pairs
+        ),
+    )
+    # Strings are packed last, as other tables add strings to the table.
+    string_offsets, string_blob = _pack_tables(
+        strings.values,
+        lambda string: string.encode("utf-8"),
+    )
+
+    sections = [
+        string_offsets,
+        string_blob,
+        list_offsets,
+        list_items,
+        mapping_offsets,
+        mapping_items,
+        bytes(partitions),
+        bytes(cards),
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with replace_file(path) as handle:
+        _write_sections(handle, sections)
+
+
+def _pack_tables(values: List, pack) -> Tuple[bytes, bytes]:
+    """Pack ``values`` into an offset table, and a blob of packed values.
+
+    Offsets are counted in bytes, and hold one more item for the blob end.
+    """
+    offsets = [0]
+    blob = bytearray()
+
+    for value in values:
+        blob += pack(value)
+        offsets.append(len(blob))
+
+    return b"".join(_INDEX.pack(offset) for offset in offsets), bytes(blob)
+
+
+def _write_sections(handle, sections: List[bytes]):
+    table_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = _align(table_size)
+    table = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections))]
+    padded = []
+
+    for section in sections:
+        table.append(_SECTION.pack(offset, len(section)))
+        padding = bytes(_align(len(section)) - len(section))
+        padded.append(section + padding)
+        offset += len(section) + len(padding)
+
+    handle.write(b"".join(table))
+    handle.write(bytes(_align(table_size) - table_size))
+    for section in padded:
+        handle.write(section)
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class CardSnapshot:
+    """A memory mapped, read-only snapshot file.
+
+    Close it once done, or use it as a context manager.
+
+    Raises:
+        UnsupportedSnapshot: If the file is not a snapshot of this format version.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        with open(path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                # Empty files cannot be mapped.
+                raise UnsupportedSnapshot(f"{path} is not a card snapshot.") from error
+
+        try:
+            self._sections = self._read_sections()
+            self._partitions = self._read_partitions()
+        except (struct.error, ValueError) as error:
+            self._map.close()
+            raise UnsupportedSnapshot(f"{path} is not a card snapshot.") from error
+        except BaseException:
+            self._map.close()
+            raise
+
+    def __enter__(self) -> CardSnapshot:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of cards in the snapshot."""
+        return self._sections[_CARDS][1] // _CARD.size
+
+    def close(self):
+        """Unmap the snapshot file."""
+        self._map.close()
+
+    def partitions(self) -> List[Tuple[QueryType, str]]:
+        """Return the partitions held by the snapshot."""
+        return list(self._partitions)
+
+    def cards(self, query: QueryType, set_code: str) -> List[CardView]:
+        """Return views of the cards of a partition, or an empty list."""
+        first, count = self._partitions.get((query, set_code), (0, 0))
+        return [CardView(self, index) for index in range(first, first + count)]
+
+    def string(self, index: int) -> str:
+        """Decode a string of the string table."""
+        start, end = self._range(_STRING_OFFSETS, index)
+        offset = self._sections[_STRINGS][0]
+        return self._map[offset + start : offset + end].decode("utf-8")
+
+    def items(self, index: int) -> List[str]:
+        """Decode a list of the list table."""
+        start, end = self._range(_LIST_OFFSETS, index)
+        offset = self._sections[_LIST_ITEMS][0]
+        return [
+            self.string(_INDEX.unpack_from(self._map, position)[0])
+            for position in range(offset + start, offset + end, _INDEX.size)
+        ]
+
+    def mapping(self, index: int) -> Dict[str, str]:
+        """Decode a mapping of the mapping table."""
+        start, end = self._range(_MAPPING_OFFSETS, index)
+        offset = self._sections[_MAPPING_ITEMS][0]
+        mapping = {}
+        for position in range(offset + start, offset + end, _PAIR.size):
+            key, value = _PAIR.unpack_from(self._map, position)
+            mapping[self.string(key)] = self.string(value)
+        return mapping
+
+    def record(self, index: int) -> Tuple[int, ...]:
+        """Return the fixed-width record of a card."""
+        offset = self._sections[_CARDS][0] + index * _CARD.size
+        return _CARD.unpack_from(self._map, offset)
+
+    def _range(self, section: int, index: int) -> Tuple[int, int]:
+        """Return the start and end offsets of item ``index`` of an offset table."""
+        position = self._sections[section][0] + index * _INDEX.size
+        start = _INDEX.unpack_from(self._map, position)[0]
+        end = _INDEX.unpack_from(self._map, position + _INDEX.size)[0]
+        return start, end
+
+    def _read_sections(self) -> List[Tuple[int, int]]:
+        magic, version, count = _HEADER.unpack_from(self._map)
+
+        if magic != MAGIC or version != FORMAT_VERSION or count != _SECTIONS:
+            raise UnsupportedSnapshot(f"Unsupported snapshot {magic!r} v{version}.")
+
+        sections = [
+            _SECTION.unpack_from(self._map, _HEADER.size + index * _SECTION.size)
+            for index in range(count)
+        ]
+
+        if any(offset + size > len(self._map) for offset, size in sections):
+            raise UnsupportedSnapshot("Truncated snapshot.")
+
+        return sections
+
+    def _read_partitions(self) -> Dict[Tuple[QueryType, str], Tuple[int, int]]:
+        offset, size = self._sections[_PARTITIONS]
+        partitions = {}
+
+        for position in range(offset, offset + size, _PARTITION.size):
+            query, set_code, first, count = _PARTITION.unpack_from(self._map, position)
+            key = (QueryType(self.string(query)), self.string(set_code))
+            partitions[key] = (first, count)
+
+        return partitions
+
+
+class CardView:
+    """A card of a `CardSnapshot`, decoded lazily on attribute access.
+
+    Call `CardView.to_card` to decode every field at once.
+    """
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: CardSnapshot, index: int):
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getattr__(self, name: str):
+        if name not in _FIELDS:
+            raise AttributeError(name)
+
+        return self._decode(self._snapshot.record(self._index), name)
+
+    def __repr__(self) -> str:
+        return f"CardView({self.name!r})"
+
+    def to_card(self) -> Card:
+        """Decode this card into a `Card` model."""
+        record = self._snapshot.record(self._index)
+        return Card.construct(
+            **{field: self._decode(record, field) for field in Card.__fields__}
+        )
+
+    def to_record(self) -> CardRecord:
+        """Decode this card into a `CardRecord`, without building a model."""
+        record = self._snapshot.record(self._index)
+        values = {field: self._decode(record, field) for field in CardRecord.FIELDS}
+        for field in LIST_FIELDS:
+            values[field] = tuple(values[field])
+        for field in MAPPING_FIELDS:
+            values[field] = MappingProxyType(values[field])
+        return CardRecord(**values)
+
+    def _decode(self, record: Tuple[int, ...], field: str):
+        position, kind = _FIELDS[field]
+        value = record[position]
+
+        if kind == _STRING:
+            return self._snapshot.string(value)
+        if kind == _LIST:
+            return self._snapshot.items(value)
+        if kind == _MAPPING:
+            return self._snapshot.mapping(value)
+        return bool(value)
+
+
+class SnapshotSource(CardSource):
+    """A card source reading a `CardSnapshot`.
+
+    Pushdown queries are ignored, as filters run locally anyway.
+    Queries without sets read every partition of their type.
+    """
+
+    def __init__(self, snapshot: CardSnapshot):
+        self.snapshot = snapshot
+
+    def iter_cards(self, builder: SetQueryBuilder) -> Iterator[AnyCard]:
+        sets: Optional[List[str]] = builder.sets or None
+
+        if sets is None:
+            sets = [
+                set_code
+                for query, set_code in self.snapshot.partitions()
+                if query == builder.type
+            ]
+
+        # Like the cache, cards printed in several sets are kept once, from
+        # the first set, and sorted by name.
+        views: Dict[str, CardView] = {}
+
+        for set_code in sets:
+            for view in self.snapshot.cards(builder.type, set_code):
+                views.setdefault(view.name, view)
+
+        for name in sorted(views):
+            yield views[name].to_record()
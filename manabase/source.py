@@ -0,0 +1,22 @@
+"""Card sources.
+
+A card source returns the cards matching a `SetQueryBuilder`, either from the
+scryfall API or from local data.
+"""
+from abc import ABCMeta, abstractmethod
+from typing import Iterator, Sequence
+
+from .cards import AnyCard
+from .query import SetQueryBuilder
+
+
+class CardSource(metaclass=ABCMeta):
+    """Provides cards matching a query."""
+
+    @abstractmethod
+    def iter_cards(self, builder: SetQueryBuilder) -> Iterator[AnyCard]:
+        """Iterate over a filtered list of cards."""
+
+    def fetch(self, builder: SetQueryBuilder) -> Sequence[AnyCard]:
+        """Fetch a filtered list of cards."""
+        return list(self.iter_cards(builder))
@@ -0,0 +1,218 @@
+"""A columnar table of cards.
+
+Filtering cards one at a time runs Python code for each card.
+A `CardTable` instead holds a pool of cards column by column:
+
+- Names and oracle texts, as lists of strings.
+- Set codes, as small integers indexing `CardTable.set_codes`.
+- Colors, color identities and produced mana, as masks of `MANA_BITS`.
+
+Selections of cards are bitsets: Python integers, whose bit ``i`` is set when
+the card at row ``i`` is selected. They are combined with the ``&``, ``|``,
+``^`` and ``~`` operators over the whole pool at once.
+
+Set and mana columns hold few distinct values, so a bitset is computed once per
+distinct value. A predicate on one of these columns is then evaluated once per
+distinct value, and not once per card.
+
+Example::
+
+```python
+>>> from manabase.cards import Card
+>>> from manabase.table import CardTable, mana_mask
+>>> cards = [
+...     Card.named("Tundra").copy(update={"produced_mana": ["W", "U"]}),
+...     Card.named("Badlands").copy(update={"produced_mana": ["B", "R"]}),
+... ]
+>>> table = CardTable(cards)
+>>> azorius = mana_mask("WU")
+>>> mask = table.where("produced_mana", lambda value: value & ~azorius == 0)
+>>> [card.name for card in table.select(mask)]
+['Tundra']
+>>> [card.name for card in table.select(table.all & ~mask)]
+['Badlands']
+
+```
+"""
+from __future__ import annotations
+
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Pattern,
+    Tuple,
+)
+
+from .cache import CacheManager
+from .cards import AnyCard
+from .query import QueryType
+from .serialization import ValueTable
+
+MANA_BITS: Dict[str, int] = {
+    "W": 1 << 0,
+    "U": 1 << 1,
+    "B": 1 << 2,
+    "R": 1 << 3,
+    "G": 1 << 4,
+    "C": 1 << 5,
+}
+
+MASK_COLUMNS = ("colors", "color_identity", "produced_mana")
+
+
+def mana_mask(symbols: Iterable[str]) -> int:
+    """Encode mana symbols, such as ``["W", "U"]``, into a mask.
+
+    Unknown symbols are not encoded.
+    """
+    mask = 0
+
+    for symbol in symbols:
+        mask |= MANA_BITS.get(symbol, 0)
+
+    return mask
+
+
+def mask_symbols(mask: int) -> List[str]:
+    """Decode a mask into mana symbols, in `MANA_BITS` order."""
+    return [symbol for symbol, bit in MANA_BITS.items() if mask & bit]
+
+
+class CardTable:  # pylint: disable=too-many-instance-attributes
+    """A pool of cards, stored column by column.
+
+    ``cards`` keeps the cards the table was built from, so that selections can
+    return them.
+    """
+
+    def __init__(self, cards: Iterable[AnyCard]):
+        self.cards: List[AnyCard] = list(cards)
+        self.names: List[str] = [card.name for card in self.cards]
+        self.oracle_texts: List[str] = [card.oracle_text for card in self.cards]
+
+        set_codes = ValueTable()
+        self.sets = array("H", [set_codes.index(card.set) for card in self.cards])
+        self.set_codes: List[str] = set_codes.values  # type: ignore
+
+        self.colors = self._mask_column("colors")
+        self.color_identity = self._mask_column("color_identity")
+        self.produced_mana = self._mask_column("produced_mana")
+
+        self._value_bitsets: Dict[str, Dict[int, int]] = {}
+
+    @classmethod
+    def from_cache(
+        cls,
+        cache: CacheManager,
+        query: QueryType,
+        sets: List[str],
+    ) -> CardTable:
+        """Build a table from the cached cards of ``query`` in ``sets``."""
+        return cls(cache.read_cache(query, sets))
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @property
+    def all(self) -> int:
+        """Bitset selecting every card."""
+        return (1 << len(self)) - 1
+
+    def where(self, column: str, predicate: Callable[[int], bool]) -> int:
+        """Select cards whose value in a set or mask column matches ``predicate``.
+
+        ``column`` is ``"sets"``, whose values index `CardTable.set_codes`, or
+        one of `MASK_COLUMNS`.
+        """
+        mask = 0
+
+        for value, rows in self._bitsets(column).items():
+            if predicate(value):
+                mask |= rows
+
+        return mask
+
+    def where_sets(self, sets: Iterable[str]) -> int:
+        """Select cards printed in one of ``sets``."""
+        codes = set(sets)
+        return self.where("sets", lambda value: self.set_codes[value] in codes)
+
+    def where_text(self, pattern: Pattern[str]) -> int:
+        """Select cards whose oracle text matches ``pattern``."""
+        return self.where_oracle(pattern.match)
+
+    def where_oracle(self, predicate: Callable[[str], Any]) -> int:
+        """Select cards whose oracle text matches ``predicate``.
+
+        Oracle texts are mostly distinct, so ``predicate`` is called once per
+        card.
+        """
+        return bitset(
+            index for index, text in enumerate(self.oracle_texts) if predicate(text)
+        )
+
+    def indexes(self, mask: int) -> Iterator[int]:
+        """Iterate over the rows selected by ``mask``, in order."""
+        data = mask.to_bytes(max((len(self) + 7) // 8, 1), "little")
+
+        for offset, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield offset * 8 + low.bit_length() - 1
+                byte ^= low
+
+    def select(self, mask: int) -> List[AnyCard]:
+        """Return the cards selected by ``mask``, in order."""
+        return [self.cards[index] for index in self.indexes(mask)]
+
+    @staticmethod
+    def count(mask: int) -> int:
+        """Return the number of cards selected by ``mask``."""
+        return bin(mask).count("1")
+
+    def _mask_column(self, field: str) -> array:
+        # Few distinct symbol lists exist, so each is encoded once.
+        masks: Dict[Tuple[str, ...], int] = {}
+        column = array("B")
+
+        for card in self.cards:
+            symbols = tuple(getattr(card, field))
+            try:
+                column.append(masks[symbols])
+            except KeyError:
+                masks[symbols] = mana_mask(symbols)
+                column.append(masks[symbols])
+
+        return column
+
+    def _bitsets(self, column: str) -> Dict[int, int]:
+        """Return a bitset of rows for each distinct value of ``column``."""
+        if column not in self._value_bitsets:
+            rows: Dict[int, List[int]] = {}
+
+            for index, value in enumerate(getattr(self, column)):
+                rows.setdefault(value, []).append(index)
+
+            self._value_bitsets[column] = {
+                value: bitset(indexes) for value, indexes in rows.items()
+            }
+
+        return self._value_bitsets[column]
+
+
+def bitset(indexes: Iterable[int]) -> int:
+    """Return a bitset with the bits of ``indexes`` set."""
+    data = bytearray()
+
+    for index in indexes:
+        offset = index >> 3
+        if offset >= len(data):
+            data.extend(bytes(offset - len(data) + 1))
+        data[offset] |= 1 << (index & 7)
+
+    return int.from_bytes(data, "little")
@@ -1,10 +1,11 @@
 """Test utilities."""
 from pathlib import Path
-from typing import Callable, Iterator
+from typing import Callable, Iterator, List
 
 import pytest
 
 from manabase.cards import Card
+from manabase.client import Client
 
 
 @pytest.fixture(scope="session")
@@ -54,3 +55,17 @@ def cache(tmp_path: Path) -> Iterator[Path]:
 def fixtures_dir() -> Iterator[Path]:
     """Provides the path to the fixtures (data) directory."""
     yield Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture()
+def sleeps(monkeypatch) -> Iterator[List[float]]:
+    """Records client retry delays instead of waiting.
+
+    Only the client is patched, so that other sleeps, such as those of
+    diskcache locks, still wait.
+    """
+    delays: List[float] = []
+
+    monkeypatch.setattr(Client, "_sleep", staticmethod(delays.append))
+
+    yield delays
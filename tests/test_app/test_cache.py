@@ -0,0 +1,227 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from typer.testing import CliRunner
+
+from manabase.app import app
+from manabase.cache import CacheManager
+from manabase.cards import Card
+from manabase.client import Client
+from manabase.query import QueryType, SetQueryBuilder
+
+runner = CliRunner()
+
+
+def fake_update_set(
+    self: Client,
+    builder: SetQueryBuilder,
+    set_code: str,
+    conditional: bool = False,  # pylint: disable=unused-argument
+) -> Optional[List[Card]]:
+    assert self.cache is not None
+    cards = [Card.named(f"{set_code} land").copy(update={"set": set_code})]
+    self.cache.write_cache(builder.type, [set_code], cards)
+    return cards
+
+
+def test_warm(fresh_settings: Path, cache: Path, monkeypatch):
+    monkeypatch.setattr(Client, "_update_set", fake_update_set)
+    CacheManager(cache).write_cache(QueryType.land, ["vma"], [])
+
+    args = [f"--config={fresh_settings}", f"--cache={cache}", "cache", "warm"]
+    result = runner.invoke(app, args + ["--sets=vma,2xm me4", "--types=land"])
+
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    # Sets are reported in completion order.
+    assert sorted(line.split("] ")[1] for line in lines[:-1]) == [
+        "land 2xm: 1",
+        "land me4: 1",
+    ]
+    assert lines[-1].startswith("Warmed 2 sets (2 cards) in ")
+    assert not CacheManager(cache).missing_sets(QueryType.land, ["vma", "2xm", "me4"])
+
+    result = runner.invoke(app, args + ["--sets=vma 2xm", "--types=land"])
+
+    assert result.exit_code == 0
+    assert result.stdout == "Cache is already warm.\n"
+
+
+def test_warm_defaults_to_presets_sets(fresh_settings: Path, cache: Path, monkeypatch):
+    monkeypatch.setattr(Client, "_update_set", fake_update_set)
+    runner.invoke(
+        app,
+        [f"--config={fresh_settings}", "presets", "new", "default", "--sets=me4"],
+    )
+
+    result = runner.invoke(
+        app,
+        [f"--config={fresh_settings}", f"--cache={cache}", "cache", "warm"],
+    )
+
+    assert result.exit_code == 0
+    manager = CacheManager(cache)
+    assert not manager.missing_sets(QueryType.land, ["ala", "znc", "me4"])
+    assert not manager.missing_sets(QueryType.artifact, ["ala", "znc", "me4"])
+
+
+def test_warm_unknown_type(fresh_settings: Path, cache: Path):
+    result = runner.invoke(
+        app,
+        [
+            f"--config={fresh_settings}",
+            f"--cache={cache}",
+            "cache",
+            "warm",
+            "--types=elf",
+        ],
+    )
+
+    assert result.exit_code == 1
+
+
+def test_clear(fresh_settings: Path, cache: Path):
+    CacheManager(cache).write_cache(QueryType.land, ["vma"], [])
+
+    result = runner.invoke(
+        app,
+        [f"--config={fresh_settings}", f"--cache={cache}", "cache", "clear"],
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout == "Cache cleared.\n"
+    assert CacheManager(cache).missing_sets(QueryType.land, ["vma"]) == ["vma"]
+
+
+def test_stats(fresh_settings: Path, cache: Path, monkeypatch):
+    monkeypatch.setattr(Client, "_update_set", fake_update_set)
+    CacheManager(cache).write_cache(
+        QueryType.land, ["vma"], [Card.named("a").copy(update={"set": "vma"})]
+    )
+    args = [f"--config={fresh_settings}", f"--cache={cache}", "cache"]
+
+    result = runner.invoke(app, args + ["warm", "--sets=vma 2xm", "--types=land"])
+
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, args + ["stats"])
+
+    assert result.exit_code == 0
+    assert "Partitions: 2" in result.stdout
+    assert "  land vma: " in result.stdout
+    assert "  land 2xm: " in result.stdout
+
+    result = runner.invoke(app, args + ["stats", "--json"])
+
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    # Statistics were recorded by the warm command.
+    assert data["stats"]["hits"] > 0
+    assert data["stats"]["misses"] > 0
+    assert data["stats"]["writes"] > 0
+    assert sorted((item["type"], item["set"]) for item in data["partitions"]) == [
+        ("land", "2xm"),
+        ("land", "vma"),
+    ]
+
+
+def test_prune(fresh_settings: Path, cache: Path, tmp_path: Path, monkeypatch):
+    root = tmp_path / "versions"
+    (root / "0.0.1").mkdir(parents=True)
+    (root / "cards").mkdir()
+    monkeypatch.setattr(
+        CacheManager, "default_path", staticmethod(lambda: root / "cards")
+    )
+
+    result = runner.invoke(
+        app,
+        [f"--config={fresh_settings}", f"--cache={cache}", "cache", "prune"],
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout.endswith("Pruned 1 cache directories and 0 sets.\n")
+    assert [path.name for path in root.iterdir()] == ["cards"]
+
+
+def test_other_commands_do_not_prune(
+    fresh_settings: Path,
+    tmp_path: Path,
+    monkeypatch,
+):
+    root = tmp_path / "versions"
+    (root / "0.0.1").mkdir(parents=True)
+    monkeypatch.setattr(
+        CacheManager, "default_path", staticmethod(lambda: root / "cards")
+    )
+
+    result = runner.invoke(app, [f"--config={fresh_settings}", "cache", "stats"])
+
+    assert result.exit_code == 0
+    assert (root / "0.0.1").is_dir()
+
+
+def test_export_import(fresh_settings: Path, cache: Path, tmp_path: Path):
+    CacheManager(cache).write_cache(
+        QueryType.land, ["vma"], [Card.named("a").copy(update={"set": "vma"})]
+    )
+    path = tmp_path / "cards.tar.gz"
+    other = tmp_path / "other"
+
+    result = runner.invoke(
+        app,
+        [
+            f"--config={fresh_settings}",
+            f"--cache={cache}",
+            "cache",
+            "export",
+            str(path),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout.startswith("Exported 1 sets")
+
+    result = runner.invoke(
+        app,
+        [
+            f"--config={fresh_settings}",
+            f"--cache={other}",
+            "cache",
+            "import",
+            str(path),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout.startswith("Imported 1 sets")
+    assert not CacheManager(other).missing_sets(QueryType.land, ["vma"])
+
+    path.write_bytes(b"garbage")
+    result = runner.invoke(
+        app,
+        [
+            f"--config={fresh_settings}",
+            f"--cache={other}",
+            "cache",
+            "import",
+            str(path),
+        ],
+    )
+
+    assert result.exit_code == 1
+
+    result = runner.invoke(
+        app,
+        [
+            f"--config={fresh_settings}",
+            f"--cache={other}",
+            "cache",
+            "import",
+            str(tmp_path / "missing.tar.gz"),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert result.stdout.startswith("Cannot read archive")
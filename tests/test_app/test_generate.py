@@ -1,9 +1,13 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring
+import json
 from pathlib import Path
+from typing import List
 
+import requests
 from typer.testing import CliRunner
 
 from manabase.app import app
+from manabase.client import Client
 
 runner = CliRunner()
 
@@ -270,3 +274,91 @@ def test_generate_preset(fixtures_dir: Path):
         "19 Island\n"
         "5 Swamp\n"
     )
+
+
+class ScryfallSession(requests.Session):
+    """Answers searches with a fixed pool of cards, by query type."""
+
+    POOL = {
+        "land": [
+            {
+                "name": "Tundra",
+                "oracle_text": "({T}: Add {W} or {U}.)",
+                "produced_mana": ["W", "U"],
+            },
+            {
+                "name": "Badlands",
+                "oracle_text": "({T}: Add {B} or {R}.)",
+                "produced_mana": ["B", "R"],
+            },
+        ],
+        "artifact": [
+            {
+                "name": "Azorius Signet",
+                "oracle_text": "{1}, {T}: Add {W}{U}.",
+                "produced_mana": ["W", "U"],
+            },
+        ],
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.queries: List[str] = []
+
+    def get(self, url, **kwargs):  # pylint: disable=arguments-differ
+        query = kwargs["params"]["q"]
+        self.queries.append(query)
+
+        type_ = query.split()[0][len("t:") :]
+        cards = [
+            {
+                "colors": [],
+                "color_identity": [],
+                "legalities": {},
+                "textless": False,
+                "scryfall_uri": "",
+                "set": "vma",
+                **card,
+            }
+            for card in self.POOL[type_]
+        ]
+
+        response = requests.Response()
+        response.status_code = 200
+        # pylint: disable=protected-access
+        response._content = json.dumps({"data": cards, "has_more": False}).encode()
+        return response
+
+
+def test_generate_offline(fresh_settings: Path, cache: Path, monkeypatch):
+    session = ScryfallSession()
+    monkeypatch.setattr(Client, "_create_session", classmethod(lambda _: session))
+    args = [
+        f"--config={fresh_settings}",
+        f"--cache={cache}",
+        "generate",
+        "WU",
+        "--sets=vma",
+        "--lands=3",
+        "--rocks=1",
+    ]
+
+    result = runner.invoke(app, args)
+
+    assert result.exit_code == 0, result.stdout
+    assert result.stdout == (
+        "// Rocks\n"
+        "1 Azorius Signet\n"
+        "// Lands\n"
+        "1 Tundra\n"
+        "1 Plains\n"
+        "1 Island\n"
+    )
+    assert sorted(session.queries) == ["t:artifact (set:vma)", "t:land (set:vma)"]
+
+    # Cached sets are read again, even to narrow them down with a pushdown.
+    result = runner.invoke(app, [*args, "--pushdown"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "1 Tundra\n" in result.stdout
+    assert len(session.queries) == 2
@@ -0,0 +1,120 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import io
+import os
+import stat
+import tarfile
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from manabase import archive as archive_module
+from manabase.archive import UnsupportedArchive, export_cache, import_cache
+from manabase.cache import CacheManager
+from manabase.cards import Card
+from manabase.query import QueryType
+
+
+@pytest.fixture(name="archive_path")
+def fixture_archive_path(
+    cache: Path,
+    tmp_path: Path,
+    make_card: Callable[..., Card],
+) -> Path:
+    manager = CacheManager(cache)
+    manager.write_cache(
+        QueryType.land,
+        ["vma", "2xm"],
+        [make_card(name="Tundra", set="vma"), make_card(name="Arena", set="2xm")],
+        etag='"abc"',
+    )
+    manager.write_cache(QueryType.artifact, ["2xm"], [])
+
+    path = tmp_path / "cards.tar.gz"
+    manifest = export_cache(manager, path)
+
+    assert [(entry.type, entry.set) for entry in manifest.partitions] == [
+        (QueryType.artifact, "2xm"),
+        (QueryType.land, "2xm"),
+        (QueryType.land, "vma"),
+    ]
+
+    return path
+
+
+def test_archive_round_trip(archive_path: Path, tmp_path: Path):
+    manager = CacheManager(tmp_path / "imported")
+
+    manifest = import_cache(manager, archive_path)
+
+    assert len(manifest.partitions) == 3
+    assert not manager.missing_sets(QueryType.land, ["vma", "2xm"])
+    assert not manager.missing_sets(QueryType.artifact, ["2xm"])
+    assert [card.name for card in manager.read_cache(QueryType.land, ["vma"])] == [
+        "Tundra"
+    ]
+
+    info = manager.partition_info(QueryType.land, "vma")
+    assert info is not None
+    assert info.etag == '"abc"'
+    assert manager.stats.writes == 3
+
+
+def test_archive_checksum_mismatch(archive_path: Path, tmp_path: Path):
+    corrupted = tmp_path / "corrupted.tar.gz"
+
+    with tarfile.open(archive_path, "r:gz") as source:
+        with tarfile.open(corrupted, "w:gz") as target:
+            for member in source.getmembers():
+                data = source.extractfile(member).read()  # type: ignore
+                if member.name == "partitions/land/vma":
+                    data = data[:-1] + bytes([data[-1] ^ 1])
+                target.addfile(member, io.BytesIO(data))
+
+    manager = CacheManager(tmp_path / "imported")
+
+    with pytest.raises(UnsupportedArchive, match="land vma"):
+        import_cache(manager, corrupted)
+
+    # Nothing is imported from a corrupted archive.
+    assert not list(manager.iter_partitions())
+
+
+def test_archive_other_schema(archive_path: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(archive_module, "SCHEMA_VERSION", "other")
+
+    with pytest.raises(UnsupportedArchive):
+        import_cache(CacheManager(tmp_path / "imported"), archive_path)
+
+
+def test_archive_invalid_file(tmp_path: Path):
+    path = tmp_path / "cards.tar.gz"
+    path.write_bytes(b"garbage")
+
+    with pytest.raises(UnsupportedArchive):
+        import_cache(CacheManager(tmp_path / "imported"), path)
+
+
+def test_archive_is_readable_by_other_users(cache: Path, tmp_path: Path):
+    path = tmp_path / "cards.tar.gz"
+    umask = os.umask(0o022)
+
+    try:
+        export_cache(CacheManager(cache), path)
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_archive_missing_file(tmp_path: Path):
+    with pytest.raises(UnsupportedArchive):
+        import_cache(CacheManager(tmp_path / "imported"), tmp_path / "missing")
+
+
+def test_archive_export_creates_directories(cache: Path, tmp_path: Path):
+    path = tmp_path / "archives" / "cards.tar.gz"
+
+    export_cache(CacheManager(cache), path)
+
+    assert path.is_file()
@@ -0,0 +1,98 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import gzip
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from manabase.bulk import BulkDataSource, iter_json_array
+from manabase.query import SetQueryBuilder
+
+
+def make_object(name: str, type_line: str, set_: str) -> Dict:
+    return {
+        "object": "card",
+        "name": name,
+        "type_line": type_line,
+        "oracle_text": "",
+        "colors": [],
+        "color_identity": [],
+        "legalities": {},
+        "textless": False,
+        "scryfall_uri": "",
+        "set": set_,
+        "prices": {"usd": "1.00"},
+    }
+
+
+@pytest.fixture(name="objects")
+def fixture_objects() -> List[Dict]:
+    return [
+        make_object("Tundra", "Land — Plains Island", "vma"),
+        make_object("Sol Ring", "Artifact", "c13"),
+        make_object("Arid Mesa", "Land", "znc"),
+        make_object("Tundra", "Land — Plains Island", "vma"),
+        make_object("Forest", "Basic Land — Forest", "lea"),
+        make_object("Dryad Arbor", "Land Creature — Forest Dryad", "vma"),
+    ]
+
+
+def test_iter_json_array_small_chunks(objects: List[Dict]):
+    handle = StringIO(json.dumps(objects, indent=2))
+
+    assert list(iter_json_array(handle, chunk_size=7)) == objects
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 12))
+def test_iter_json_array_scalars(chunk_size: int):
+    content = "[1, 23, -4.5e6, true, null, 678]"
+    handle = StringIO(content)
+
+    assert list(iter_json_array(handle, chunk_size=chunk_size)) == json.loads(content)
+
+
+def test_iter_json_array_empty():
+    assert not list(iter_json_array(StringIO("  [ ]  ")))
+
+
+def test_iter_json_array_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_array(StringIO('{"object": "list"}')))
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(StringIO('[{"name": "Tundra"}, {"na')))
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(StringIO("[1 2]")))
+
+
+def test_bulk_data_source_filters(tmp_path: Path, objects: List[Dict]):
+    path = tmp_path / "default-cards.json"
+    path.write_text(json.dumps(objects))
+
+    source = BulkDataSource(path, chunk_size=32)
+    builder = SetQueryBuilder(type="land", sets=["vma", "znc"])
+
+    assert [card.name for card in source.iter_cards(builder)] == [
+        "Tundra",
+        "Arid Mesa",
+        "Dryad Arbor",
+    ]
+    assert [card.name for card in source.fetch(builder)] == [
+        "Arid Mesa",
+        "Dryad Arbor",
+        "Tundra",
+    ]
+
+
+def test_bulk_data_source_gzip(tmp_path: Path, objects: List[Dict]):
+    path = tmp_path / "default-cards.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        json.dump(objects, handle)
+
+    source = BulkDataSource(path)
+    builder = SetQueryBuilder(type="artifact", sets=[])
+
+    assert [card.name for card in source.fetch(builder)] == ["Sol Ring"]
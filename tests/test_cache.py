@@ -0,0 +1,280 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from manabase import cache as cache_module
+from manabase import serialization
+from manabase.cache import CacheManager, EvictionPolicy
+from manabase.cards import Card
+from manabase.query import QueryType
+
+
+def test_cache_partitions_by_set(cache: Path, make_card: Callable[..., Card]):
+    manager = CacheManager(cache)
+    tundra = make_card(name="Tundra", set="vma")
+    arena = make_card(name="Arena", set="2xm")
+
+    manager.write_cache(QueryType.land, ["vma", "2xm"], [tundra, arena])
+
+    assert manager.read_cache(QueryType.land, ["vma"]) == [tundra]
+    assert manager.read_cache(QueryType.land, ["2xm", "vma"]) == [arena, tundra]
+    assert not manager.read_cache(QueryType.artifact, ["vma"])
+
+
+def test_cache_missing_sets(cache: Path, make_card: Callable[..., Card]):
+    manager = CacheManager(cache)
+
+    manager.write_cache(QueryType.land, ["vma", "me4"], [make_card(set="vma")])
+
+    # A set without any card is cached as an empty partition.
+    assert manager.missing_sets(QueryType.land, ["me4", "2xm", "vma"]) == ["2xm"]
+    assert manager.has_cache(QueryType.land, ["me4", "vma"])
+    assert not manager.has_cache(QueryType.land, ["vma", "2xm"])
+    assert not manager.has_cache(QueryType.land, [])
+
+
+def test_cache_merges_reprints(cache: Path, make_card: Callable[..., Card]):
+    manager = CacheManager(cache)
+    first = make_card(name="Command Tower", set="cmr")
+    second = make_card(name="Command Tower", set="c20")
+
+    manager.write_cache(QueryType.land, ["cmr"], [first])
+    manager.write_cache(QueryType.land, ["c20"], [second])
+
+    assert manager.read_cache(QueryType.land, ["cmr", "c20"]) == [first]
+
+
+def test_cache_reads_from_memory(
+    cache: Path,
+    make_card: Callable[..., Card],
+    monkeypatch,
+):
+    manager = CacheManager(cache)
+    manager.write_cache(QueryType.land, ["vma"], [make_card(set="vma")])
+
+    # Reopen the cache, so the partition is not in memory yet.
+    manager = CacheManager(cache)
+    loads = []
+
+    def load_cards(data: bytes) -> List[Card]:
+        loads.append(data)
+        return serialization.load_cards(data)
+
+    monkeypatch.setattr(cache_module, "load_cards", load_cards)
+
+    for _ in range(3):
+        assert len(manager.read_cache(QueryType.land, ["vma"])) == 1
+
+    assert len(loads) == 1
+
+
+def test_cache_memory_sees_other_writers(
+    cache: Path,
+    make_card: Callable[..., Card],
+):
+    reader = CacheManager(cache)
+    writer = CacheManager(cache)
+
+    writer.write_cache(QueryType.land, ["vma"], [make_card(name="a", set="vma")])
+    assert [card.name for card in reader.read_cache(QueryType.land, ["vma"])] == ["a"]
+
+    writer.write_cache(QueryType.land, ["vma"], [make_card(name="b", set="vma")])
+    assert [card.name for card in reader.read_cache(QueryType.land, ["vma"])] == ["b"]
+
+    writer.clear()
+    assert not reader.read_cache(QueryType.land, ["vma"])
+
+
+def test_cache_drops_unreadable_partitions(
+    cache: Path,
+    make_card: Callable[..., Card],
+):
+    manager = CacheManager(cache, memory_size=0)
+    manager.write_cache(QueryType.land, ["vma"], [make_card(set="vma")])
+
+    # pylint: disable=protected-access
+    manager._index[("cards", "land", "vma")] = b"garbage"
+
+    assert not manager.read_cache(QueryType.land, ["vma"])
+    assert manager.missing_sets(QueryType.land, ["vma"]) == ["vma"]
+
+
+def test_cache_stale_sets(cache: Path, monkeypatch):
+    manager = CacheManager(cache, ttl=60.0)
+    manager.write_cache(QueryType.land, ["vma", "2xm"], [])
+
+    assert not manager.stale_sets(QueryType.land, ["vma", "2xm", "me4"])
+
+    now = time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 120.0)
+    manager.touch(QueryType.land, "2xm")
+
+    assert manager.stale_sets(QueryType.land, ["vma", "2xm", "me4"]) == ["vma"]
+
+    manager.ttl = None
+
+    assert not manager.stale_sets(QueryType.land, ["vma"])
+
+
+def test_cache_stats(cache: Path, make_card: Callable[..., Card]):
+    manager = CacheManager(cache)
+
+    manager.missing_sets(QueryType.land, ["vma"])
+    manager.write_cache(QueryType.land, ["vma"], [make_card(set="vma")])
+    manager.read_cache(QueryType.land, ["vma"])
+
+    assert manager.stats.misses == 1
+    assert manager.stats.writes == 1
+    assert manager.stats.memory_hits == 1
+
+    other = CacheManager(cache)
+    other.missing_sets(QueryType.land, ["vma"])
+    other.read_cache(QueryType.land, ["vma"])
+
+    assert other.stats.hits == 1
+    assert other.stats.disk_reads == 1
+    assert other.stats.bytes_read > 0
+
+    manager.save_stats()
+    other.save_stats()
+
+    totals = CacheManager(cache).total_stats()
+    assert (totals.hits, totals.misses, totals.writes) == (1, 1, 1)
+    assert totals.hit_rate == 0.5
+    assert not manager.stats.writes
+
+
+def test_cache_concurrent_writes(cache: Path, make_card: Callable[..., Card]):
+    managers = [CacheManager(cache, memory_size=0) for _ in range(4)]
+
+    def write(manager: CacheManager, index: int):
+        for round_ in range(10):
+            name = f"{index}-{round_}"
+            manager.write_cache(
+                QueryType.land, ["vma"], [make_card(name=name, set="vma")]
+            )
+            manager.touch(QueryType.land, "vma")
+
+    threads = [
+        threading.Thread(target=write, args=(manager, index))
+        for index, manager in enumerate(managers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The last write wins, with cards and metadata in sync.
+    (card,) = CacheManager(cache).read_cache(QueryType.land, ["vma"])
+    info = CacheManager(cache).partition_info(QueryType.land, "vma")
+    assert info is not None
+    assert card.name.endswith("-9")
+    assert info.size == len(serialization.dump_cards([card]))
+
+
+def test_cache_evicts_least_recently_used(
+    cache: Path,
+    make_card: Callable[..., Card],
+    monkeypatch,
+):
+    size = len(serialization.dump_cards([make_card(set="vma")]))
+    manager = CacheManager(cache, max_size=2 * size)
+    now = time.time()
+
+    for offset, set_code in enumerate(["vma", "2xm"]):
+        monkeypatch.setattr(
+            cache_module.time, "time", lambda offset=offset: now + offset
+        )
+        manager.write_cache(QueryType.land, [set_code], [make_card(set=set_code)])
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 10)
+    manager.read_cache(QueryType.land, ["vma"])
+    manager.save_stats()
+
+    manager.write_cache(QueryType.land, ["me4"], [make_card(set="me4")])
+
+    assert manager.missing_sets(QueryType.land, ["vma", "2xm", "me4"]) == ["2xm"]
+    assert manager.stats.evictions == 1
+
+
+def test_cache_evicts_least_frequently_used(
+    cache: Path,
+    make_card: Callable[..., Card],
+):
+    size = len(serialization.dump_cards([make_card(set="vma")]))
+    manager = CacheManager(cache, max_size=2 * size, eviction=EvictionPolicy.lfu)
+
+    manager.write_cache(QueryType.land, ["vma"], [make_card(set="vma")])
+    manager.write_cache(QueryType.land, ["2xm"], [make_card(set="2xm")])
+
+    for _ in range(3):
+        manager.read_cache(QueryType.land, ["vma"])
+    manager.read_cache(QueryType.land, ["2xm"])
+
+    manager.write_cache(QueryType.land, ["me4"], [make_card(set="me4")])
+
+    assert manager.missing_sets(QueryType.land, ["vma", "2xm", "me4"]) == ["2xm"]
+
+
+def test_cache_never_evicts_written_sets(
+    cache: Path,
+    make_card: Callable[..., Card],
+):
+    manager = CacheManager(cache, max_size=1)
+
+    manager.write_cache(QueryType.land, ["vma"], [make_card(set="vma")])
+    manager.write_cache(QueryType.land, ["2xm"], [make_card(set="2xm")])
+
+    assert manager.missing_sets(QueryType.land, ["vma", "2xm"]) == ["vma"]
+
+
+def test_cache_prune_versions(tmp_path: Path, monkeypatch):
+    root = tmp_path / "manabase"
+    for name in ["0.1.0", "0.10.0", "cards", "logs"]:
+        (root / name).mkdir(parents=True)
+
+    monkeypatch.setattr(
+        CacheManager, "default_path", staticmethod(lambda: root / "cards")
+    )
+
+    removed = CacheManager.prune_versions()
+
+    assert sorted(path.name for path in removed) == ["0.1.0", "0.10.0"]
+    assert sorted(path.name for path in root.iterdir()) == ["cards", "logs"]
+
+
+def test_cache_drops_other_schemas(
+    cache: Path,
+    make_card: Callable[..., Card],
+    monkeypatch,
+):
+    manager = CacheManager(cache)
+    manager.write_cache(QueryType.land, ["vma", "2xm"], [make_card(set="vma")])
+
+    # Cache written by a release whose schema differs for a single partition.
+    monkeypatch.setattr(cache_module, "SCHEMA_VERSION", "other")
+    manager.write_cache(QueryType.land, ["2xm"], [make_card(set="2xm")])
+    monkeypatch.undo()
+
+    manager = CacheManager(cache)
+
+    assert manager.missing_sets(QueryType.land, ["vma", "2xm"]) == ["2xm"]
+    assert [set_code for _, set_code, _ in manager.iter_partitions()] == ["vma"]
+    assert not manager.read_cache(QueryType.land, ["2xm"])
+    assert len(manager.read_cache(QueryType.land, ["vma"])) == 1
+    assert not manager.drop_incompatible()
+
+
+def test_cache_reads_metadata_of_other_versions(cache: Path):
+    manager = CacheManager(cache)
+    manager.write_cache(QueryType.land, ["vma"], [])
+
+    # pylint: disable=protected-access
+    info = manager._index[("info", "land", "vma")]
+    manager._index[("info", "land", "vma")] = {**info, "added_later": True}
+    manager._index["stats"] = {"hits": 2}
+
+    assert manager.partition_info(QueryType.land, "vma") is not None
+    assert manager.total_stats().hits == 2
@@ -1,7 +1,9 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring
 from typing import Callable
 
-from manabase.cards import Card
+import pytest
+
+from manabase.cards import Card, CardList, CardRecord
 
 
 def test_card_hashable(make_card: Callable[..., Card]):
@@ -25,8 +27,80 @@ def test_card_eq(make_card: Callable[..., Card]):
     assert card1 == card2
 
 
+def test_card_identity(make_card: Callable[..., Card]):
+    tundra = make_card(name="Tundra", set="vma")
+
+    assert tundra.identity == ("Tundra", "vma")
+    assert tundra != make_card(name="Tundra", set="me4")
+    # Cards with the same identity are equal, even with other data.
+    assert tundra == make_card(name="Tundra", set="vma", oracle_text="{T}")
+    assert tundra != "Tundra"
+
+    printing = make_card(name="Tundra", set="vma", id="a", oracle_id="b")
+
+    assert printing.identity == "a"
+    assert printing != tundra
+    assert printing == make_card(name="Renamed", set="vma", id="a")
+    assert len({printing, printing.copy(), tundra}) == 2
+
+
+def test_card_identity_follows_updates(make_card: Callable[..., Card]):
+    card = make_card(name="Tundra", set="vma")
+
+    assert card.copy(update={"set": "me4"}).identity == ("Tundra", "me4")
+    assert Card.construct(**card.dict()).identity == ("Tundra", "vma")
+
+    card.set = "me4"
+
+    assert card.identity == ("Tundra", "me4")
+    assert hash(card) == hash(("Tundra", "me4"))
+
+
 def test_card_lt(make_card: Callable[..., Card]):
     card1 = make_card(name="Plains")
     card2 = make_card(name="Swamp")
 
     assert card1 < card2
+
+
+def test_card_record_round_trip(make_card: Callable[..., Card]):
+    card = make_card(
+        name="Tundra",
+        produced_mana=["W", "U"],
+        legalities={"vintage": "legal"},
+        set="vma",
+        id="a",
+    )
+
+    record = CardRecord.from_card(card)
+
+    assert record.produced_mana == ("W", "U")
+    assert record.legalities["vintage"] == "legal"
+    assert record.to_card().json() == card.json()
+    assert record == card and card == record
+    assert hash(record) == hash(card)
+    assert record < make_card(name="Underground Sea")
+
+
+def test_card_record_immutable(make_card: Callable[..., Card]):
+    record = CardRecord.from_card(make_card(name="Tundra"))
+
+    with pytest.raises(AttributeError):
+        record.name = "Plains"
+
+    with pytest.raises(TypeError):
+        record.legalities["vintage"] = "banned"  # type: ignore
+
+    assert not hasattr(record, "__dict__")
+
+
+def test_card_list_add_record(make_card: Callable[..., Card]):
+    card_list = CardList(2)
+    record = CardRecord.from_card(make_card(name="Tundra", colors=["W"]))
+
+    card_list.add_card(record, 1)
+    card_list.add_card(record, 1)
+
+    (entry,) = card_list.entries
+    assert entry.occurrences == 2
+    assert entry.colors == ["W"]
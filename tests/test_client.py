@@ -0,0 +1,487 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from manabase import client as client_module
+from manabase.cache import CacheManager
+from manabase.client import AsyncClient, Client, RetryPolicy
+from manabase.query import SetQueryBuilder
+from manabase.ratelimit import RateLimiter
+
+
+def make_response(
+    status: int = 200,
+    data: Optional[Dict] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    # pylint: disable=protected-access
+    response._content = json.dumps(data or {}).encode()
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    return response
+
+
+def make_page(names: List[str], has_more: bool = False) -> Dict:
+    cards = [
+        {
+            "name": name,
+            "oracle_text": "",
+            "colors": [],
+            "color_identity": [],
+            "legalities": {},
+            "textless": False,
+            "scryfall_uri": "",
+            "set": "set",
+        }
+        for name in names
+    ]
+    page = {"data": cards, "has_more": has_more}
+    if has_more:
+        page["next_page"] = "https://api.scryfall.com/cards/search?page=2"
+    return page
+
+
+def make_client(session: requests.Session, **kwargs) -> Client:
+    limiter = RateLimiter(rate=1000.0, burst=1000.0)
+    return Client(session=session, limiter=limiter, **kwargs)
+
+
+class FakeSession(requests.Session):
+    """Replays a list of responses or exceptions."""
+
+    def __init__(self, responses: List):
+        super().__init__()
+        self.responses = responses
+        self.calls: List[Dict] = []
+
+    def get(self, url, **kwargs):  # pylint: disable=arguments-differ
+        self.calls.append({"url": url, **kwargs})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_retry_policy_delay_bounds():
+    policy = RetryPolicy(backoff_factor=1.0, backoff_max=5.0)
+
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= min(5.0, 2**attempt)
+
+
+def test_retry_policy_retry_after_date():
+    policy = RetryPolicy()
+
+    assert policy.delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_client_reuses_session(sleeps: List[float]):
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a"], has_more=True)),
+            make_response(data=make_page(["b"])),
+        ]
+    )
+    client = make_client(session, timeout=1.0)
+
+    cards = client.fetch(SetQueryBuilder(type="land", sets=[]))
+
+    assert [card.name for card in cards] == ["a", "b"]
+    assert [call["url"] for call in session.calls] == [
+        "https://api.scryfall.com/cards/search",
+        "https://api.scryfall.com/cards/search?page=2",
+    ]
+    assert session.calls[1]["params"] is None
+    assert all(call["timeout"] == 1.0 for call in session.calls)
+    assert not sleeps
+
+
+def test_client_retries_throttled_requests(sleeps: List[float]):
+    session = FakeSession(
+        [
+            make_response(status=429, headers={"Retry-After": "3"}),
+            make_response(status=503),
+            requests.ConnectionError(),
+            make_response(data=make_page(["a"])),
+        ]
+    )
+    client = make_client(session)
+
+    cards = client.fetch(SetQueryBuilder(type="land", sets=[]))
+
+    assert [card.name for card in cards] == ["a"]
+    assert len(session.calls) == 4
+    assert sleeps[0] == 3.0
+
+
+def test_client_gives_up_after_retries(sleeps: List[float]):
+    session = FakeSession([make_response(status=500) for _ in range(3)])
+    client = make_client(session, retry=RetryPolicy(retries=2))
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch(SetQueryBuilder(type="land", sets=[]))
+
+    assert len(sleeps) == 2
+
+
+@pytest.mark.usefixtures("sleeps")
+def test_client_empty_search():
+    session = FakeSession([make_response(status=404)])
+    client = make_client(session)
+
+    assert not client.fetch(SetQueryBuilder(type="land", sets=[]))
+
+
+@pytest.mark.usefixtures("sleeps")
+def test_client_iter_cards_is_lazy():
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a", "b"], has_more=True)),
+            make_response(data=make_page(["c"])),
+        ]
+    )
+    client = make_client(session)
+
+    cards = client.iter_cards(SetQueryBuilder(type="land", sets=[]))
+
+    assert next(cards).name == "a"
+    assert len(session.calls) == 1
+
+    assert [card.name for card in cards] == ["b", "c"]
+    assert len(session.calls) == 2
+
+
+@pytest.mark.usefixtures("sleeps")
+def test_client_prefetches_next_page():
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a"], has_more=True)),
+            make_response(data=make_page(["b"])),
+        ]
+    )
+    client = make_client(session, prefetch=True)
+
+    cards = client.iter_cards(SetQueryBuilder(type="land", sets=[]))
+
+    assert next(cards).name == "a"
+
+    deadline = time.monotonic() + 5
+    while len(session.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The second page was downloaded before we asked for it.
+    assert len(session.calls) == 2
+    assert [card.name for card in cards] == ["b"]
+
+
+@pytest.mark.usefixtures("sleeps")
+def test_client_prefetch_raises_errors():
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a"], has_more=True)),
+            make_response(status=400),
+        ]
+    )
+    client = make_client(session, prefetch=True)
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch(SetQueryBuilder(type="land", sets=[]))
+
+
+def test_async_client_fetch():
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a"], has_more=True)),
+            make_response(data=make_page(["b"])),
+        ]
+    )
+    client = AsyncClient(make_client(session))
+
+    cards = asyncio.run(client.fetch(SetQueryBuilder(type="land", sets=[])))
+
+    assert [card.name for card in cards] == ["a", "b"]
+
+
+def test_async_client_prefetches_next_page(monkeypatch):
+    requested = threading.Event()
+    session = FakeSession(
+        [
+            make_response(data=make_page(["a"], has_more=True)),
+            make_response(data=make_page(["b"])),
+        ]
+    )
+
+    def get(url, **kwargs):
+        response = FakeSession.get(session, url, **kwargs)
+        if len(session.calls) == 2:
+            requested.set()
+        return response
+
+    monkeypatch.setattr(session, "get", get)
+    decode = client_module.decode_cards
+    decoded = []
+
+    def decode_cards(data):
+        # The second page is requested while the first one is decoded.
+        decoded.append(requested.wait(timeout=5))
+        return decode(data)
+
+    client = AsyncClient(make_client(session, prefetch=True))
+    monkeypatch.setattr(client_module, "decode_cards", decode_cards)
+
+    cards = asyncio.run(client.fetch(SetQueryBuilder(type="land", sets=[])))
+
+    assert [card.name for card in cards] == ["a", "b"]
+    assert decoded == [True, True]
+
+
+def test_async_client_concurrent_fetch():
+    session = FakeSession(
+        [make_response(data=make_page(["a"])), make_response(data=make_page(["b"]))]
+    )
+    client = AsyncClient(make_client(session))
+
+    async def fetch_both():
+        return await asyncio.gather(
+            client.fetch(SetQueryBuilder(type="land", sets=[])),
+            client.fetch(SetQueryBuilder(type="artifact", sets=[])),
+        )
+
+    lands, artifacts = asyncio.run(fetch_both())
+
+    assert len(lands) == len(artifacts) == 1
+
+
+class QuerySession(FakeSession):
+    """Answers each query with a page named after its sets."""
+
+    def __init__(self):
+        super().__init__([])
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.calls.append({"url": url, **kwargs})
+        query = kwargs["params"]["q"]
+        names = [part.strip("()") for part in query.split() if "set:" in part]
+        return make_response(data=make_page(names + ["shared"]))
+
+
+def test_client_sharded_fetch():
+    session = QuerySession()
+    client = make_client(session)
+
+    builder = SetQueryBuilder(type="land", sets=["a", "b", "c"])
+    cards = client.fetch(builder, shard_size=1)
+
+    assert len(session.calls) == 3
+    assert [card.name for card in cards] == ["set:a", "set:b", "set:c", "shared"]
+
+
+def test_async_client_sharded_fetch():
+    session = QuerySession()
+    client = AsyncClient(make_client(session))
+
+    builder = SetQueryBuilder(type="land", sets=["a", "b", "c"])
+    cards = asyncio.run(client.fetch(builder, shard_size=2))
+
+    assert len(session.calls) == 2
+    assert [card.name for card in cards] == ["set:a", "set:b", "set:c", "shared"]
+
+
+@pytest.mark.usefixtures("sleeps")
+def test_client_does_not_cache_pushdown(cache: Path):
+    session = FakeSession(
+        [make_response(data=make_page(["a"])), make_response(data=make_page(["a"]))]
+    )
+    client = make_client(session, cache=CacheManager(cache))
+
+    builder = SetQueryBuilder(type="land", sets=["set"], pushdown="fo:a")
+    client.fetch(builder)
+
+    assert not client.cache.has_cache(builder.type, builder.sets)
+
+    builder = SetQueryBuilder(type="land", sets=["set"])
+    client.fetch(builder)
+
+    assert client.cache.has_cache(builder.type, builder.sets)
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_client_reads_pushdown_from_cache(cache: Path, asynchronous: bool):
+    session = FakeSession([make_response(data=make_page(["a", "b"]))])
+    client = make_client(session, cache=CacheManager(cache))
+
+    client.fetch(SetQueryBuilder(type="land", sets=["set"]))
+
+    builder = SetQueryBuilder(type="land", sets=["set"], pushdown="fo:a")
+    if asynchronous:
+        cards = asyncio.run(AsyncClient(client).fetch(builder, shard_size=1))
+    else:
+        cards = client.fetch(builder, shard_size=1)
+
+    # The full pool is read from the cache, and left to filters.
+    assert len(session.calls) == 1
+    assert [card.name for card in cards] == ["a", "b"]
+    assert client.cache.stats.hits == 1
+
+
+class SetSession(FakeSession):
+    """Answers each single set query with a card printed in that set."""
+
+    def __init__(self):
+        super().__init__([])
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        query = kwargs["params"]["q"]
+        set_code = query.split("set:")[1].strip("()")
+        with self.lock:
+            self.calls.append({"url": url, "set": set_code, **kwargs})
+        page = make_page([set_code])
+        page["data"][0]["set"] = set_code
+        return make_response(data=page)
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_client_fetches_missing_sets_only(cache: Path, asynchronous: bool):
+    session = SetSession()
+    client = make_client(session, cache=CacheManager(cache))
+
+    def fetch(sets: List[str]):
+        builder = SetQueryBuilder(type="land", sets=sets)
+        if asynchronous:
+            return asyncio.run(AsyncClient(client).fetch(builder))
+        return client.fetch(builder)
+
+    fetch(["a", "b"])
+
+    assert sorted(call["set"] for call in session.calls) == ["a", "b"]
+
+    cards = fetch(["b", "c"])
+
+    assert [card.name for card in cards] == ["b", "c"]
+    assert [call["set"] for call in session.calls[2:]] == ["c"]
+
+
+class ConditionalSession(SetSession):
+    """Answers conditional requests with a 304 while ``modified`` is unset."""
+
+    def __init__(self):
+        super().__init__()
+        self.modified = False
+
+    def get(self, url, **kwargs):
+        response = super().get(url, **kwargs)
+        if (kwargs.get("headers") or {}).get("If-None-Match") and not self.modified:
+            return make_response(status=304)
+        response.headers["ETag"] = '"v2"' if self.modified else '"v1"'
+        return response
+
+
+@pytest.mark.parametrize("modified", [False, True])
+def test_client_refreshes_stale_sets(cache: Path, modified: bool):
+    session = ConditionalSession()
+    client = make_client(session, cache=CacheManager(cache, ttl=60.0))
+    builder = SetQueryBuilder(type="land", sets=["a"])
+
+    client.fetch(builder)
+
+    # Age the partition past its time to live.
+    info = client.cache.partition_info(builder.type, "a")
+    # pylint: disable=protected-access
+    client.cache._index[("info", "land", "a")] = info.copy(
+        update={"fetched_at": info.fetched_at - 120.0}
+    )
+    assert client.cache.stale_sets(builder.type, ["a"]) == ["a"]
+
+    session.modified = modified
+
+    # Stale cards are served while the refresh runs.
+    assert [card.name for card in client.fetch(builder)] == ["a"]
+
+    client.close()
+
+    assert len(session.calls) == 2
+    assert session.calls[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert not client.cache.stale_sets(builder.type, ["a"])
+    assert client.cache.partition_info(builder.type, "a").etag == (
+        '"v2"' if modified else '"v1"'
+    )
+
+
+class BarrierSession(ConditionalSession):
+    """Holds conditional requests until ``parties`` of them are sent."""
+
+    def __init__(self, parties: int):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5.0)
+
+    def get(self, url, **kwargs):
+        if (kwargs.get("headers") or {}).get("If-None-Match"):
+            self.barrier.wait()
+        return super().get(url, **kwargs)
+
+
+def test_client_refreshes_stale_sets_in_parallel(cache: Path):
+    session = BarrierSession(parties=2)
+    client = make_client(session, cache=CacheManager(cache, ttl=60.0), jobs=2)
+    builder = SetQueryBuilder(type="land", sets=["a", "b"])
+
+    client.fetch(builder)
+
+    # Age the partitions past their time to live.
+    for set_code in builder.sets:
+        info = client.cache.partition_info(builder.type, set_code)
+        # pylint: disable=protected-access
+        client.cache._index[("info", "land", set_code)] = info.copy(
+            update={"fetched_at": info.fetched_at - 120.0}
+        )
+
+    client.fetch(builder)
+    client.close()
+
+    # Both refreshes were waiting for each other, which a single thread
+    # could not do.
+    assert not session.barrier.broken
+    assert not client.cache.stale_sets(builder.type, ["a", "b"])
+
+
+class SlowSession(SetSession):
+    """Takes a while to answer."""
+
+    def get(self, url, **kwargs):
+        time.sleep(0.2)
+        return super().get(url, **kwargs)
+
+
+def test_clients_fetch_missing_sets_once(cache: Path):
+    session = SlowSession()
+    clients = [make_client(session, cache=CacheManager(cache)) for _ in range(3)]
+    builder = SetQueryBuilder(type="land", sets=["a"])
+
+    threads = [
+        threading.Thread(target=client.fetch, args=(builder,)) for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Clients waited for the first fetch instead of sending their own.
+    assert len(session.calls) == 1
+    # Each client looked the set up once.
+    for client in clients:
+        stats = client.cache.stats
+        assert stats.hits + stats.misses == 1
+    for client in clients:
+        assert [card.name for card in client.fetch(builder)] == ["a"]
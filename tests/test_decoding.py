@@ -0,0 +1,57 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+from typing import Dict
+
+from manabase.decoding import decode_card, decode_cards, project
+
+
+def make_object(**data) -> Dict:
+    obj = {
+        "name": "Tundra",
+        "oracle_text": "",
+        "colors": [],
+        "color_identity": [],
+        "legalities": {},
+        "textless": False,
+        "scryfall_uri": "",
+        "set": "vma",
+        "prices": {"usd": "500.00"},
+        "artist": "Jesper Myrfors",
+    }
+    obj.update(data)
+    return obj
+
+
+def test_project_drops_unused_fields():
+    obj = make_object()
+    data = project(obj)
+
+    assert "prices" not in data
+    assert "artist" not in data
+    assert data["produced_mana"] == []
+    # The original object is left untouched.
+    assert "produced_mana" not in obj
+
+
+def test_decode_untrusted_validates():
+    assert decode_card(make_object(textless="maybe")) is None
+    assert decode_card(make_object(textless="true")).textless is True
+
+
+def test_decode_trusted_skips_validation():
+    card = decode_card(make_object(produced_mana=["W", "U"]), trusted=True)
+
+    assert card.name == "Tundra"
+    assert card.produced_mana == ["W", "U"]
+
+
+def test_decode_trusted_missing_fields():
+    obj = make_object()
+    del obj["set"]
+
+    assert decode_card(obj, trusted=True) is None
+
+
+def test_decode_cards_skips_invalid():
+    objects = [make_object(), make_object(colors=None), make_object(name="Plains")]
+
+    assert [card.name for card in decode_cards(objects)] == ["Tundra", "Plains"]
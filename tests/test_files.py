@@ -0,0 +1,32 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import os
+from pathlib import Path
+
+import pytest
+
+from manabase.files import replace_file
+
+
+def test_replace_file_keeps_file_on_error(tmp_path: Path):
+    path = tmp_path / "data"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with replace_file(path) as handle:
+            handle.write(b"new")
+            raise RuntimeError()
+
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["data"]
+
+
+def test_replace_file_leaves_umask_alone(tmp_path: Path):
+    umask = os.umask(0o027)
+    try:
+        with replace_file(tmp_path / "data") as handle:
+            assert os.umask(0o027) == 0o027
+            handle.write(b"new")
+    finally:
+        os.umask(umask)
+
+    assert (tmp_path / "data").stat().st_mode & 0o777 == 0o640
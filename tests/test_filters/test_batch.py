@@ -0,0 +1,133 @@
+"""Test filtering `CardTable` batches."""
+
+# pylint: disable=missing-function-docstring
+from typing import Callable, List
+
+import pytest
+
+from manabase.cards import Card
+from manabase.colors import Color
+from manabase.filter import manager as manager_module
+from manabase.filter.manager import FilterManager
+from manabase.filter.parser import parse_filter_string
+from manabase.filters.base import CardFilter
+from manabase.filters.set import CardSetFilter
+from manabase.table import CardTable
+
+FILTER_STRINGS = [
+    "original",
+    "producer",
+    "reference",
+    "producer & original",
+    "shock | fetch",
+    "(original | shock) & producer",
+    "original ^ producer",
+    "~original",
+    "~(shock | original) & reference",
+    "signet | talisman | locket",
+]
+
+
+@pytest.fixture(name="cards")
+def fixture_cards(make_card: Callable[..., Card]) -> List[Card]:
+    return [
+        make_card(
+            name="Tundra",
+            oracle_text="({T}: Add {W} or {U}.)",
+            produced_mana=["W", "U"],
+            set="vma",
+        ),
+        make_card(
+            name="Hallowed Fountain",
+            oracle_text=(
+                "({T}: Add {W} or {U}.)\n"
+                "As Hallowed Fountain enters the battlefield, you may pay 2 life. "
+                "If you don't, it enters the battlefield tapped."
+            ),
+            produced_mana=["W", "U"],
+            set="rna",
+        ),
+        make_card(
+            name="Flooded Strand",
+            oracle_text=(
+                "{T}, Pay 1 life, Sacrifice Flooded Strand: Search your library "
+                "for a Plains or Island card, put it onto the battlefield, then "
+                "shuffle."
+            ),
+            set="ktk",
+        ),
+        make_card(
+            name="Badlands",
+            oracle_text="({T}: Add {B} or {R}.)",
+            produced_mana=["B", "R"],
+            set="vma",
+        ),
+        make_card(
+            name="Azorius Signet",
+            oracle_text="{1}, {T}: Add {W}{U}.",
+            produced_mana=["W", "U"],
+            set="2xm",
+        ),
+        make_card(name="Sol Ring", oracle_text="{T}: Add {C}{C}.", produced_mana=["C"]),
+    ]
+
+
+@pytest.mark.parametrize("string", FILTER_STRINGS)
+def test_batch_matches_filter_card(string: str, cards: List[Card]):
+    filter_ = parse_filter_string(string, [Color.white, Color.blue])
+    table = CardTable(cards)
+
+    results = [filter_.filter_card(card) for card in cards]
+    expected = [result for result in results if result.accepted_by is not None]
+
+    assert filter_.accept_batch(table).results(table) == expected
+    assert filter_.filter_batch(table) == sum(
+        1 << index
+        for index, result in enumerate(results)
+        if result.accepted_by is not None
+    )
+
+
+def test_batch_tracks_accepting_filters(cards: List[Card]):
+    filter_ = parse_filter_string("original | shock", [Color.white, Color.blue])
+    table = CardTable(cards)
+
+    results = filter_.accept_batch(table).results(table)
+
+    assert [
+        (result.card.name, type(result.accepted_by).__name__) for result in results
+    ] == [
+        ("Tundra", "OriginalDualLandFilter"),
+        ("Hallowed Fountain", "ShockLandFilter"),
+        ("Badlands", "OriginalDualLandFilter"),
+    ]
+
+
+def test_batch_falls_back_to_filter_card(cards: List[Card]):
+    class NamedFilter(CardFilter):
+        def filter_card(self, card):
+            return CardSetFilter(sets=["vma"]).filter_card(card)
+
+    table = CardTable(cards)
+
+    assert table.select(NamedFilter().filter_batch(table)) == [cards[0], cards[3]]
+
+
+def test_filter_manager_filters_chunks(cards: List[Card], monkeypatch):
+    filter_ = parse_filter_string("original | shock", [Color.white, Color.blue])
+    manager = FilterManager(colors=[Color.white, Color.blue], filters=filter_)
+    expected = manager.filter_cards(cards)
+    sizes = []
+
+    class RecordingTable(CardTable):
+        """Records the size of each table."""
+
+        def __init__(self, chunk):
+            super().__init__(chunk)
+            sizes.append(len(self))
+
+    monkeypatch.setattr(manager_module, "CardTable", RecordingTable)
+    monkeypatch.setattr(FilterManager, "CHUNK_SIZE", 4)
+
+    assert manager.filter_cards(iter(cards)) == expected
+    assert sizes == [4, 2, 0]
@@ -1,7 +1,9 @@
 """Test `CompositeFilter`."""
+
 # pylint: disable=no-self-use, missing-function-docstring
-from manabase.cards import Card
+from manabase.cards import Card, CardRecord
 from manabase.colors import Color
+from manabase.filter.manager import FilterManager
 from manabase.filters.base import FilterResult
 from manabase.filters.composite import CompositeFilter
 
@@ -87,3 +89,14 @@ def test_composite_filter_invert(make_card):
 
     card.colors = ["W"]
     assert filter_.filter_card(card).accepted_by is None
+
+
+def test_filter_manager_uses_records(make_card):
+    manager = FilterManager(colors=[Color.white], filters=WhiteColorFilter())
+    cards = [make_card(name="a", colors=["W"]), make_card(name="b")]
+
+    (result,) = manager.filter_cards(cards)
+
+    assert isinstance(result.card, CardRecord)
+    assert result.card == cards[0]
+    assert result == FilterResult(card=cards[0], accepted_by=manager.filters)
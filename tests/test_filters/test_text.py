@@ -0,0 +1,40 @@
+"""Test `CardTextFilter`."""
+
+# pylint: disable=missing-function-docstring
+import re
+
+from manabase.filters import text
+from manabase.filters.lands.shock import ShockLandFilter
+from manabase.filters.text import CardTextFilter
+
+
+def test_card_text_filter_compiles_once(make_card, monkeypatch):
+    first = ShockLandFilter()
+    second = ShockLandFilter()
+
+    assert first.regex() is second.regex()
+
+    compiled = []
+
+    def compile_(pattern, flags=0):
+        compiled.append(pattern)
+        return re.compile(pattern, flags)
+
+    monkeypatch.setattr(text.re, "compile", compile_)
+    card = make_card(oracle_text="({T}: Add {W} or {U}.)")
+
+    for filter_ in [first, second, first]:
+        filter_.filter_card(card)
+
+    assert not compiled
+
+
+def test_card_text_filter_follows_pattern_changes(make_card):
+    filter_ = CardTextFilter(pattern="%(tap)s: Add %(c)s")
+    card = make_card(oracle_text="{T}: Add {U}.")
+
+    assert filter_.filter_card(card).accepted_by is None
+
+    filter_.pattern = "%(tap)s: Add %(symbols)s"
+
+    assert filter_.filter_card(card).accepted_by is filter_
@@ -0,0 +1,24 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+from manabase.lru import LRUCache
+
+
+def test_lru_discards_least_recently_used():
+    cache: LRUCache[int] = LRUCache(maxsize=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_disabled():
+    cache: LRUCache[int] = LRUCache(maxsize=0)
+
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
@@ -0,0 +1,157 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+from typing import Iterator, List
+
+from manabase.cards import Card
+from manabase.colors import Color
+from manabase.filter.manager import FilterManager
+from manabase.filter.pushdown import longest_literal, translate_filter
+from manabase.filters.base import FilterResult
+from manabase.filters.colors import (
+    BasicLandReferencedFilter,
+    ProducedManaFilter,
+)
+from manabase.filters.composite import CompositeFilter
+from manabase.filters.lands.fetch import FetchLandFilter
+from manabase.filters.lands.shock import ShockLandFilter
+from manabase.filters.set import CardSetFilter
+from manabase.generator import ListGenerator
+from manabase.priorities import PriorityManager
+from manabase.query import SetQueryBuilder
+from manabase.source import CardSource
+
+
+class UnknownFilter(CompositeFilter):
+    """A filter the translator knows nothing about."""
+
+    def filter_card(self, card: Card) -> FilterResult:
+        return FilterResult(card=card)
+
+
+def test_translate_sets():
+    assert translate_filter(CardSetFilter(sets=["ala"])) == "set:ala"
+    assert translate_filter(CardSetFilter(sets=["ala", "ktk"])) == (
+        "(set:ala or set:ktk)"
+    )
+    assert translate_filter(CardSetFilter(sets=[])) is None
+
+
+def test_translate_produced_mana():
+    filter_ = ProducedManaFilter(
+        colors=[Color.white, Color.blue],
+        exclusive=False,
+        minimum_count=1,
+    )
+
+    assert translate_filter(filter_) == "(produces:w or produces:u)"
+
+
+def test_translate_basic_land_references():
+    filter_ = BasicLandReferencedFilter(colors=[Color.white, Color.blue])
+
+    assert translate_filter(filter_) == "(fo:Island or fo:Plains)"
+
+
+def test_translate_text_filters():
+    assert translate_filter(FetchLandFilter()) == (
+        'fo:"card, put it onto the battlefield, then shuffle your library."'
+    )
+    assert translate_filter(ShockLandFilter()) == (
+        "fo:\"enters the battlefield, you may pay 2 life. If you don't, "
+        'it enters the battlefield tapped."'
+    )
+
+
+def test_translate_and_keeps_translated_side():
+    filter_ = CardSetFilter(sets=["ala"]) & UnknownFilter()
+
+    assert translate_filter(filter_) == "set:ala"
+    # The translation is no longer exact, so it cannot be negated.
+    assert translate_filter(~filter_) is None
+
+
+def test_translate_or_needs_both_sides():
+    assert translate_filter(CardSetFilter(sets=["ala"]) | UnknownFilter()) is None
+
+
+def test_translate_or_groups_conjunctions():
+    left = CardSetFilter(sets=["ala"]) & BasicLandReferencedFilter(colors=[Color.white])
+    filter_ = left | FetchLandFilter()
+
+    assert translate_filter(filter_) == (
+        '((set:ala fo:Plains) or fo:"card, put it onto the battlefield, then '
+        'shuffle your library.")'
+    )
+
+
+def test_translate_invert():
+    assert translate_filter(~CardSetFilter(sets=["ala", "ktk"])) == (
+        "-(set:ala or set:ktk)"
+    )
+    assert translate_filter(~FetchLandFilter()) is None
+
+
+def test_translate_xor():
+    filter_ = CardSetFilter(sets=["ala"]) ^ CardSetFilter(sets=["ktk"])
+
+    assert translate_filter(filter_) == ("((set:ala -set:ktk) or (-set:ala set:ktk))")
+
+    filter_ = CardSetFilter(sets=["ala"]) ^ FetchLandFilter()
+    assert translate_filter(filter_).startswith("(set:ala or fo:")
+
+
+def test_translate_skips_sets_of_the_search():
+    sets = CardSetFilter(sets=["ala", "ktk"])
+    fetch = 'fo:"card, put it onto the battlefield, then shuffle your library."'
+
+    assert translate_filter(sets & FetchLandFilter(), sets=["ala"]) == fetch
+    assert translate_filter(sets & FetchLandFilter(), sets=["ala", "znr"]) == (
+        f"(set:ala or set:ktk) {fetch}"
+    )
+    assert translate_filter(sets | FetchLandFilter(), sets=["ktk"]) is None
+    assert translate_filter(~sets, sets=["ktk"]) is None
+    assert translate_filter(sets ^ ~FetchLandFilter(), sets=["ktk"]) is None
+    assert (
+        translate_filter(sets ^ CardSetFilter(sets=["ala"]), sets=["ala", "ktk"])
+        == "-set:ala"
+    )
+
+
+class RecordingSource(CardSource):
+    """Records queries, without returning any card."""
+
+    def __init__(self):
+        self.queries: List[str] = []
+
+    def iter_cards(self, builder: SetQueryBuilder) -> Iterator[Card]:
+        self.queries.append(builder.build())
+        return iter([])
+
+
+def test_generator_pushdown_sends_sets_once():
+    sets = ["ala", "ktk"]
+    generator = ListGenerator(
+        filters=FilterManager(
+            colors=[Color.white],
+            filters=CardSetFilter(sets=sets) & FetchLandFilter(),
+        ),
+        priorities=PriorityManager(priorities=[]),
+        query=SetQueryBuilder(type="land", sets=sets),
+        pushdown=True,
+    )
+    source = RecordingSource()
+
+    generator.generate(source)
+
+    assert source.queries == [
+        't:land fo:"card, put it onto the battlefield, then shuffle your library." '
+        "(set:ala or set:ktk)"
+    ]
+
+
+def test_longest_literal():
+    assert longest_literal(r"^abcd?ef$") == "abc"
+    assert longest_literal(r"^ab+cdef") == "cdef"
+    assert longest_literal(r"abc{2,3}def") == "def"
+    assert longest_literal(r"[abc]+ xyz \w+ (a|b) tuvw") == "tuvw"
+    assert longest_literal(r'say "hi there" now') == "hi there"
+    assert longest_literal(r"a.b") is None
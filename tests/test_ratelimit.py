@@ -0,0 +1,77 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from manabase.ratelimit import RateLimiter
+
+
+def test_rate_limiter_enforces_rate():
+    limiter = RateLimiter(rate=50.0, burst=1.0, concurrency=8.0)
+
+    start = time.monotonic()
+    for _ in range(6):
+        with limiter.request():
+            pass
+
+    assert time.monotonic() - start >= 5 / 50.0
+
+
+def test_rate_limiter_shared_between_threads():
+    limiter = RateLimiter(rate=50.0, burst=1.0, concurrency=8.0)
+
+    def work():
+        for _ in range(3):
+            with limiter.request():
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 5 / 50.0
+
+
+def test_rate_limiter_shared_state(tmp_path: Path):
+    path = tmp_path / "ratelimit"
+    first = RateLimiter(rate=50.0, burst=1.0, path=path)
+    second = RateLimiter(rate=50.0, burst=1.0, path=path)
+
+    start = time.monotonic()
+    for _ in range(3):
+        for limiter in (first, second):
+            with limiter.request():
+                pass
+
+    assert time.monotonic() - start >= 5 / 50.0
+
+
+def test_rate_limiter_additive_increase():
+    limiter = RateLimiter(rate=1000.0, burst=1000.0, concurrency=1.0)
+
+    for _ in range(3):
+        with limiter.request():
+            pass
+
+    assert limiter.concurrency > 2.0
+
+
+def test_rate_limiter_multiplicative_decrease():
+    limiter = RateLimiter(rate=1000.0, burst=1000.0, concurrency=8.0)
+
+    with limiter.request() as permit:
+        permit.throttled = True
+
+    assert limiter.concurrency == 4.0
+
+    with pytest.raises(RuntimeError):
+        with limiter.request():
+            raise RuntimeError()
+
+    assert limiter.concurrency == 2.0
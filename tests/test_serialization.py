@@ -0,0 +1,59 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+from typing import Callable
+
+import pytest
+
+from manabase.cards import Card
+from manabase.decoding import CARD_FIELDS
+from manabase.serialization import (
+    FLAG_FIELDS,
+    LIST_FIELDS,
+    MAPPING_FIELDS,
+    STRING_FIELDS,
+    UnsupportedFormat,
+    dump_cards,
+    load_cards,
+)
+
+
+def test_serialization_covers_card_fields():
+    fields = STRING_FIELDS + LIST_FIELDS + MAPPING_FIELDS + FLAG_FIELDS
+
+    assert sorted(fields) == sorted(CARD_FIELDS)
+
+
+def test_serialization_round_trip(make_card: Callable[..., Card]):
+    cards = [
+        make_card(
+            name="Hallowed Fountain",
+            oracle_text="({T}: Add {W} or {U}.)",
+            color_identity=["W", "U"],
+            produced_mana=["W", "U"],
+            legalities={"modern": "legal", "vintage": "legal"},
+            scryfall_uri="https://scryfall.com/card/rna/251/hallowed-fountain",
+            set="rna",
+            id="51e0a0c5-9b5b-4b1c-9f0e-4d2c8ad19d2b",
+            oracle_id="f2ba4e0d-0a1b-4f40-8d3a-1dc1d0a6d0b5",
+        ),
+        make_card(name="Ancient Tomb", textless=True, oracle_text="Dûngeon"),
+    ]
+
+    loaded = load_cards(dump_cards(cards))
+
+    assert [card.json() for card in loaded] == [card.json() for card in cards]
+    assert loaded[0].identity == cards[0].identity
+    # Strings are shared between cards.
+    assert loaded[0].legalities["modern"] is loaded[0].legalities["vintage"]
+
+
+def test_serialization_empty():
+    assert not load_cards(dump_cards([]))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"PICKLE", dump_cards([Card.named("a")])[:-4], b"MNBC\xff\x00" + bytes(4)],
+)
+def test_serialization_rejects_unknown_data(data: bytes):
+    with pytest.raises(UnsupportedFormat):
+        load_cards(data)
@@ -0,0 +1,144 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import os
+import stat
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from manabase.cache import CacheManager
+from manabase.cards import Card, CardRecord
+from manabase.query import QueryType, SetQueryBuilder
+from manabase.snapshot import (
+    CardSnapshot,
+    SnapshotSource,
+    UnsupportedSnapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture(name="snapshot_path")
+def fixture_snapshot_path(
+    cache: Path,
+    tmp_path: Path,
+    make_card: Callable[..., Card],
+) -> Path:
+    manager = CacheManager(cache)
+    manager.write_cache(
+        QueryType.land,
+        ["vma", "2xm", "me4"],
+        [
+            make_card(
+                name="Tundra",
+                oracle_text="({T}: Add {W} or {U}.)",
+                color_identity=["W", "U"],
+                produced_mana=["W", "U"],
+                legalities={"vintage": "legal", "legacy": "legal"},
+                set="vma",
+            ),
+            make_card(name="Command Tower", set="2xm"),
+            make_card(name="Arena", set="2xm", textless=True),
+        ],
+    )
+    sol_ring = make_card(name="Sol Ring", set="2xm")
+    manager.write_cache(QueryType.artifact, ["2xm"], [sol_ring])
+    command_tower = make_card(name="Command Tower", set="cmr")
+    manager.write_cache(QueryType.land, ["cmr"], [command_tower])
+
+    path = tmp_path / "cards.snapshot"
+    write_snapshot(manager, path)
+
+    return path
+
+
+def test_snapshot_round_trip(snapshot_path: Path):
+    manager = CacheManager(snapshot_path.parent / "cache")
+
+    with CardSnapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 5
+        assert sorted(snapshot.partitions(), key=str) == sorted(
+            [
+                (QueryType.artifact, "2xm"),
+                (QueryType.land, "2xm"),
+                (QueryType.land, "cmr"),
+                (QueryType.land, "me4"),
+                (QueryType.land, "vma"),
+            ],
+            key=str,
+        )
+
+        for query, set_code in snapshot.partitions():
+            cards = [view.to_card() for view in snapshot.cards(query, set_code)]
+            assert [card.json() for card in cards] == [
+                card.json() for card in manager.read_cache(query, [set_code])
+            ]
+
+        assert not snapshot.cards(QueryType.land, "me4")
+        assert not snapshot.cards(QueryType.land, "xln")
+
+
+def test_snapshot_views_are_lazy(snapshot_path: Path):
+    with CardSnapshot(snapshot_path) as snapshot:
+        (view,) = snapshot.cards(QueryType.land, "vma")
+
+        assert view.name == "Tundra"
+        assert view.produced_mana == ["W", "U"]
+        assert view.legalities == {"vintage": "legal", "legacy": "legal"}
+        assert view.textless is False
+        assert view.to_record().to_card() == view.to_card()
+
+        with pytest.raises(AttributeError):
+            view.price  # pylint: disable=pointless-statement
+
+
+def test_snapshot_source(snapshot_path: Path):
+    with CardSnapshot(snapshot_path) as snapshot:
+        source = SnapshotSource(snapshot)
+
+        builder = SetQueryBuilder(type="land", sets=["cmr", "2xm"])
+        cards = source.fetch(builder)
+
+        assert [card.name for card in cards] == ["Arena", "Command Tower"]
+        assert cards[1].set == "cmr"
+        # Cards are decoded into records, without building models.
+        assert all(isinstance(card, CardRecord) for card in cards)
+
+        builder = SetQueryBuilder(type="land", sets=[])
+        assert len(source.fetch(builder)) == 3
+
+
+@pytest.mark.parametrize("content", [b"", b"not a snapshot at all"])
+def test_snapshot_rejects_other_files(tmp_path: Path, content: bytes):
+    path = tmp_path / "cards.snapshot"
+    path.write_bytes(content)
+
+    with pytest.raises(UnsupportedSnapshot):
+        CardSnapshot(path)
+
+
+def test_snapshot_closes_invalid_files(snapshot_path: Path, monkeypatch):
+    maps = []
+
+    def read_partitions(snapshot: CardSnapshot):
+        # pylint: disable=protected-access
+        maps.append(snapshot._map)
+        raise ValueError("Unknown query type.")
+
+    monkeypatch.setattr(CardSnapshot, "_read_partitions", read_partitions)
+
+    with pytest.raises(UnsupportedSnapshot):
+        CardSnapshot(snapshot_path)
+
+    assert maps[0].closed
+
+
+def test_snapshot_is_readable_by_other_users(cache: Path, tmp_path: Path):
+    path = tmp_path / "cards.snapshot"
+    umask = os.umask(0o022)
+
+    try:
+        write_snapshot(CacheManager(cache), path)
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
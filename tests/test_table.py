@@ -0,0 +1,83 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import re
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from manabase.cache import CacheManager
+from manabase.cards import Card
+from manabase.query import QueryType
+from manabase.table import CardTable, mana_mask, mask_symbols
+
+
+@pytest.fixture(name="cards")
+def fixture_cards(make_card: Callable[..., Card]) -> List[Card]:
+    return [
+        make_card(
+            name="Tundra",
+            oracle_text="({T}: Add {W} or {U}.)",
+            color_identity=["W", "U"],
+            produced_mana=["W", "U"],
+            set="vma",
+        ),
+        make_card(name="Sol Ring", produced_mana=["C"], set="2xm"),
+        make_card(
+            name="Badlands",
+            oracle_text="({T}: Add {B} or {R}.)",
+            color_identity=["B", "R"],
+            produced_mana=["B", "R"],
+            set="vma",
+        ),
+    ]
+
+
+def test_mana_mask():
+    assert mana_mask("WU") == 0b11
+    assert mana_mask(["C", "X"]) == 0b100000
+    assert mask_symbols(mana_mask(["G", "W"])) == ["W", "G"]
+
+
+def test_table_columns(cards: List[Card]):
+    table = CardTable(cards)
+
+    assert len(table) == 3
+    assert table.names == ["Tundra", "Sol Ring", "Badlands"]
+    assert table.set_codes == ["vma", "2xm"]
+    assert list(table.sets) == [0, 1, 0]
+    assert list(table.produced_mana) == [0b11, 0b100000, 0b1100]
+    assert table.all == 0b111
+
+
+def test_table_predicates(cards: List[Card]):
+    table = CardTable(cards)
+
+    vma = table.where_sets(["vma"])
+    colorless = table.where("produced_mana", lambda value: value == mana_mask("C"))
+    blue = table.where("color_identity", lambda value: value & mana_mask("U"))
+    text = table.where_text(re.compile(r"\(\{T\}: Add \{B\}"))
+
+    assert table.select(vma) == [cards[0], cards[2]]
+    assert table.select(colorless) == [cards[1]]
+    assert table.select(vma & ~blue) == [cards[2]]
+    assert table.select(text | colorless) == [cards[1], cards[2]]
+    assert table.count(vma) == 2
+    assert not table.select(0)
+
+
+def test_table_indexes_large_pool(make_card: Callable[..., Card]):
+    cards = [make_card(name=str(index), set=str(index % 3)) for index in range(1000)]
+    table = CardTable(cards)
+
+    mask = table.where_sets(["0"])
+
+    assert list(table.indexes(mask)) == list(range(0, 1000, 3))
+
+
+def test_table_from_cache(cache: Path, cards: List[Card]):
+    manager = CacheManager(cache)
+    manager.write_cache(QueryType.land, ["vma", "2xm"], cards)
+
+    table = CardTable.from_cache(manager, QueryType.land, ["vma"])
+
+    assert table.names == ["Badlands", "Tundra"]